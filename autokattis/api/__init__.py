@@ -1,36 +1,102 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import closing
+from hashlib import sha1
+from shutil import copyfileobj
+from tempfile import SpooledTemporaryFile
+from threading import Lock
+from urllib.parse import urlencode
+import math
+import re
+import zipfile
 
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup as bs
+from lxml import html
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+
+try:                import requests_cache
+except ImportError: requests_cache = None
 
 from .databasemanager import DatabaseManager
 from .loginmanager import LoginManager
-from .utils import suppress_warnings
+from .utils import get_html_parser
 
 class ABCKattis(ABC):
     class Result(list):
+        __slots__ = ('_df',)
+
         def __init__(self, data):
             super().__init__(data)
-            self.to_df = lambda: pd.DataFrame(data)
-
-    def __init__(self, base_url, username, password):
-        suppress_warnings()
-        self.session = requests.Session()
-        self.session.__init__()
+            self._df = None
+
+        def to_df(self):
+            # built once and reused across calls
+            if self._df is None: self._df = pd.DataFrame.from_records(self)
+            return self._df
+
+    # connection pools are shared by every session on the same Kattis instance,
+    # while cookies (and thus the login) stay with each session
+    ADAPTERS = {}
+    ADAPTERS_LOCK = Lock()
+
+    @classmethod
+    def get_adapter(cls, base_url, max_workers):
+        with cls.ADAPTERS_LOCK:
+            if base_url not in cls.ADAPTERS:
+                retry = Retry(
+                    total=5, backoff_factor=0.3, raise_on_status=False,
+                    status_forcelist=(429, 500, 502, 503, 504), allowed_methods=frozenset(['GET', 'POST', 'HEAD'])
+                )
+                # sized from the worker count with headroom for nested fetches; blocking makes any burst
+                # beyond that wait for a warm connection instead of opening throwaway sockets
+                cls.ADAPTERS[base_url] = HTTPAdapter(
+                    pool_connections=max_workers, pool_maxsize=max_workers*2, pool_block=True, max_retries=retry
+                )
+            return cls.ADAPTERS[base_url]
+
+    def __init__(self, base_url, username, password, use_cache=False, refresh_database=False):
+        self.max_workers = 6
+        if use_cache:
+            assert requests_cache, '[cache] use_cache needs requests-cache, install it with pip install autokattis[cache]'
+            # only successful GETs are kept. The cache key ignores cookies, so every account gets its own file,
+            # and pages that change with your own solves (the homepage and the filtered problem list) are never
+            # cached, just like the login page with its fresh CSRF token; your profile and submissions go stale
+            # quickly. Expired pages are revalidated with their ETag/Last-Modified when Kattis sends one, and
+            # served as-is if Kattis errors. The first matching pattern wins, so the problem statements come last
+            self.session = requests_cache.CachedSession(
+                f'autokattis-{sha1(username.encode()).hexdigest()[:12]}', backend='sqlite', use_cache_dir=True, stale_if_error=True,
+                expire_after=3600, allowable_codes=(200,), allowable_methods=('GET',),
+                urls_expire_after={
+                    '*/login/*': requests_cache.DO_NOT_CACHE,
+                    re.compile(r'^https?://[^/]+/?$'): requests_cache.DO_NOT_CACHE,
+                    re.compile(r'/problems\?'): requests_cache.DO_NOT_CACHE,
+                    '*/users/*': 60,
+                    '*?tab=submissions': 300,
+                    '*/statistics': 24*3600,
+                    '*/problems/*': 7*24*3600
+                }
+            )
+        else:
+            self.session = requests.Session()
+        self.session.mount(base_url, self.get_adapter(base_url, self.max_workers))
+        # advertises br (and zstd) only when a decoder for it is installed
+        self.session.headers.update({'Connection': 'keep-alive', 'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding']})
+        self.timeout = (5, 30)
         self.base_url = base_url
         self.homepage = ''
-        self.max_workers = 6
+        self.memo = {}
         self.username = LoginManager(self).login(username, password)
-        self.db = DatabaseManager(self)
+        self.db = DatabaseManager(self, refresh=refresh_database)
 
     def new_get(self, *args, **kwargs):
-        try:    return self.session.get(*args, **kwargs)
-        except: return self.new_get(*args, **kwargs)
+        # retries are handled by the mounted adapter
+        return self.session.get(*args, **{'timeout': self.timeout, **kwargs})
 
     def new_post(self, *args, **kwargs):
-        try:    return self.session.post(*args, **kwargs)
-        except: return self.new_post(*args, **kwargs)
+        return self.session.post(*args, **{'timeout': self.timeout, **kwargs})
 
     def get_base_url(self):
         return self.base_url
@@ -44,6 +110,12 @@ class ABCKattis(ABC):
     def get_session(self):
         return self.session
 
+    def clear_cache(self):
+        self.memo.clear()
+        if requests_cache and isinstance(self.session, requests_cache.CachedSession): self.session.cache.clear()
+        # last, so the tables are scraped afresh rather than from the pages cleared above
+        self.db = DatabaseManager(self, refresh=True)
+
     def get_max_workers(self):
         return self.max_workers
 
@@ -53,12 +125,56 @@ class ABCKattis(ABC):
     def get_database(self):
         return self.db
 
-    def get_soup_response(self, url):
-        response = self.new_get(url)
-        return bs(response.content, features='lxml')
+    def get_tree_response(self, url):
+        # let lxml read straight off the socket instead of buffering the whole body first
+        with closing(self.new_get(url, stream=True)) as response:
+            response.raw.decode_content = True
+            return html.parse(response.raw, parser=get_html_parser()).getroot()
+
+    def get_zip_response(self, url):
+        # streamed into a buffer that only spills to disk past 16 MiB, so the archive is never held twice
+        with closing(self.new_get(url, stream=True)) as response, SpooledTemporaryFile(max_size=16<<20) as buffer:
+            response.raw.decode_content = True
+            copyfileobj(response.raw, buffer)
+            buffer.seek(0)
+            with zipfile.ZipFile(buffer) as z:
+                return {inner_fn: z.read(inner_fn).decode('utf-8') for inner_fn in z.namelist()}
+
+    def paginate(self, url, params, parse_page):
+        # keeps max_workers pages in flight and refills a slot as soon as any page lands,
+        # then stops requesting once a page parses to nothing (Kattis serves empty pages past the end)
+        # each page is parsed on the thread that fetched it, so parsing overlaps the other downloads;
+        # the rest of the query is encoded once (dropping None like requests does) and only the page varies
+        query = urlencode({k: v for k, v in params.items() if k != 'page' and v is not None})
+        def fetch_page(page):
+            response = self.new_get(f'{url}?page={page}' + (f'&{query}' if query else ''))
+            # an error page that outlived the retries would parse to nothing and pass for the end
+            response.raise_for_status()
+            return parse_page(response)
+        data, next_page, first_empty = [], params['page'], math.inf
+        with ThreadPoolExecutor(max_workers=self.get_max_workers()) as executor:
+            in_flight = {}
+            def submit():
+                nonlocal next_page
+                in_flight[executor.submit(fetch_page, next_page)] = next_page
+                next_page += 1
+            for _ in range(self.get_max_workers()): submit()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for f in done:
+                    page = in_flight.pop(f)
+                    if page > first_empty: continue # cancelled, or past the end anyway
+                    rows = f.result()
+                    if rows: data.extend(rows)
+                    else:
+                        first_empty = min(first_empty, page)
+                        for g, p in in_flight.items():
+                            if p > first_empty: g.cancel()
+                    if next_page < first_empty: submit()
+        return data
 
     def load_homepage(self):
-        self.set_homepage(self.get_soup_response(self.get_base_url()))
+        self.set_homepage(self.get_tree_response(self.get_base_url()))
 
     @abstractmethod
     def problems(self, **configs):
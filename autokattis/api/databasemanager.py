@@ -1,36 +1,105 @@
-import re
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+from tempfile import NamedTemporaryFile
+from urllib.parse import urlparse
+import json
+import os
+import time
+
+from lxml import etree
+
+try:                import re2 as re
+except ImportError: import re
+
+SCRIPTS_XPATH = etree.XPath('//script/text()')
+RANKLIST_ENTRY_REGEX = re.compile('"text": "([^"]*)","url": "([^"]*)"')
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'autokattis')
+CACHE_TTL = 7*24*60*60
 
 class DatabaseManager:
-    def __init__(self, user):
+    # countries and universities are the same for every user of a Kattis instance, so they are only scraped
+    # once per base URL and shared afterwards, while the languages come from the user's own profile and are
+    # kept per account. Both are kept on disk for a week
+    TABLES = {}
+
+    def __init__(self, user, refresh=False):
         self.user = user
 
-        self.LANGUAGES = {}
-        soup = self.user.get_soup_response(f'{user.get_base_url()}/users/{user.get_username()}')
-        for option in soup.find('select', {'name': 'language'}).find_all('option'):
+        base_url, username = user.get_base_url(), user.get_username()
+        host = urlparse(base_url).netloc
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            languages = executor.submit(
+                self.get_tables, (base_url, username), f'{host}-languages-{sha1(username.encode()).hexdigest()[:12]}',
+                self.scrape_languages, refresh
+            )
+            ranklists = executor.submit(self.get_tables, base_url, f'{host}-ranklists', self.scrape_ranklists, refresh)
+            (self.LANGUAGES,), (self.COUNTRIES, self.UNIVERSITIES) = languages.result(), ranklists.result()
+
+    def get_tables(self, key, name, scrape, refresh):
+        if refresh or key not in DatabaseManager.TABLES:
+            path = os.path.join(CACHE_DIR, f'{name}.json')
+            DatabaseManager.TABLES[key] = (None if refresh else self.load(path)) or self.save(path, scrape())
+        return DatabaseManager.TABLES[key]
+
+    def load(self, path):
+        try:
+            if time.time() - os.path.getmtime(path) > CACHE_TTL: return None
+            with open(path, encoding='utf-8') as f: return tuple(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    def save(self, path, tables):
+        # written to a temporary file first so a concurrent reader never sees half a file
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with NamedTemporaryFile('w', encoding='utf-8', dir=CACHE_DIR, suffix='.tmp', delete=False) as f: json.dump(tables, f)
+            os.replace(f.name, path)
+        except OSError:
+            pass # the cache is only an optimization
+        return tables
+
+    def scrape_languages(self):
+        # the dropdown on the user's own profile, which need not be the same for every account
+        user_tree = self.user.get_tree_response(f'{self.user.get_base_url()}/users/{self.user.get_username()}')
+
+        languages = {}
+        for option in user_tree.find('.//select[@name="language"]').iter('option'):
             val = option.get('value').strip()
-            name = option.text.strip()
-            if val and name: self.LANGUAGES[val] = name
-        for val, name in [*self.LANGUAGES.items()]:
-            self.LANGUAGES[name] = self.LANGUAGES[val] = val
+            name = option.text_content().strip()
+            if val and name: languages[val] = name
+        for val, name in [*languages.items()]:
+            languages[name] = languages[val] = val
         print('[database] Listed all available languages!', flush=True)
 
-        self.COUNTRIES = {}
-        soup = user.get_soup_response(f'{user.get_base_url()}/ranklist/countries')
-        for script in soup.find_all('script'):
-            for name, code in re.findall('"text": "([^"]*)","url": "([^"]*)"', script.text):
-                _, cat, code = code.replace('\\', '').split('/')
-                name = name.encode().decode('unicode_escape')
-                if cat == 'countries': self.COUNTRIES[code] = name
-        print(f'[database] Listed all {len(self.COUNTRIES)} available countries!', flush=True)
-
-        self.UNIVERSITIES = {}
-        soup = user.get_soup_response(f'{user.get_base_url()}/ranklist/universities')
-        for script in soup.find_all('script'):
-            for name, code in re.findall('"text": "([^"]*)","url": "([^"]*)"', script.text):
-                _, cat, code = code.replace('\\', '').split('/')
-                name = name.encode().decode('unicode_escape')
-                if cat == 'universities': self.UNIVERSITIES[code] = name
-        print(f'[database] Listed all {len(self.UNIVERSITIES)} available universities!', flush=True)
+        return languages,
+
+    def scrape_ranklists(self):
+        # the two pages are independent, so fetch them concurrently
+        base_url = self.user.get_base_url()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            countries_tree, universities_tree = executor.map(self.user.get_tree_response, [
+                f'{base_url}/ranklist/countries',
+                f'{base_url}/ranklist/universities'
+            ])
+
+        countries = self.get_ranklist_entries(countries_tree, 'countries')
+        print(f'[database] Listed all {len(countries)} available countries!', flush=True)
+
+        universities = self.get_ranklist_entries(universities_tree, 'universities')
+        print(f'[database] Listed all {len(universities)} available universities!', flush=True)
+
+        return countries, universities
+
+    def get_ranklist_entries(self, tree, category):
+        # scripts without any entry are dropped up front, then the rest is matched in a single regex pass
+        scripts = '\n'.join(script for script in SCRIPTS_XPATH(tree) if '"text": "' in script)
+        entries = {}
+        for name, url in RANKLIST_ENTRY_REGEX.findall(scripts):
+            _, cat, code = url.replace('\\', '').rsplit('/', 2)
+            if cat != category: continue
+            # most names carry no escape at all, so they skip the encode/decode round trip
+            entries[code] = name.encode('latin-1', 'backslashreplace').decode('unicode_escape') if '\\' in name else name
+        return entries
 
     def get_languages(self):
         return self.LANGUAGES
@@ -1,5 +1,6 @@
-from enum import Enum, IntEnum
+from enum import Enum
 # StrEnum is not supported for <3.11
+# column indices are plain ints rather than IntEnum members, since they are only ever used to index rows
 
 class DifficultyColor(Enum):
     EASY = '#39a137'
@@ -7,7 +8,7 @@ class DifficultyColor(Enum):
     HARD = '#ff411a'
     N_A = 'gray'
 
-class SubmissionsColumn(IntEnum):
+class SubmissionsColumn():
     PLAGIARISM = 0
     SUBMISSION_TIME = 1
     GROUP_TEAM_NAME = 2
@@ -18,7 +19,7 @@ class SubmissionsColumn(IntEnum):
     TESTCASES = 7
     VIEW_DETAILS = 8
 
-class ProblemsColumn(IntEnum):
+class ProblemsColumn():
     PROBLEM_NAME = 0
     STATUS = 1
     FASTEST_RUNTIME = 2
@@ -38,14 +39,14 @@ class ProblemMetadataField():
     ATTACHMENTS = 'Attachments'
     DOWNLOADS = 'Downloads'
 
-class ProblemStatisticsColumn(IntEnum):
+class ProblemStatisticsColumn():
     RANK = 0
     NAME = 1
     RUNTIME_OR_LENGTH = 2
     LANGUAGE = 3
     DATE = 4
 
-class SolvedProblemsColumn(IntEnum):
+class SolvedProblemsColumn():
     NAME = 0
     CPU_RUNTIME = 1
     LENGTH = 2
@@ -58,21 +59,21 @@ class RanklistField():
     UNIVERSITY = 'University'
     COUNTRY = 'Country'
 
-class UserRanklistColumn(IntEnum):
+class UserRanklistColumn():
     RANK = 0
     USER = 1
     COUNTRY = 2
     UNIVERSITY = 3
     SCORE = 4
 
-class CountryRanklistColumn(IntEnum):
+class CountryRanklistColumn():
     RANK = 0
     COUNTRY = 1
     USERS = 2
     UNIVERSITIES = 3
     SCORE = 4
 
-class UniversityRanklistColumn(IntEnum):
+class UniversityRanklistColumn():
     RANK = 0
     UNIVERSITY = 1
     COUNTRY = 2
@@ -80,38 +81,38 @@ class UniversityRanklistColumn(IntEnum):
     USERS = 4
     SCORE = 5
 
-class SingleCountryRanklistColumn(IntEnum):
+class SingleCountryRanklistColumn():
     RANK = 0
     USER = 1
     SUBDIVISION = 2
     UNIVERSITY = -2
     SCORE = -1
 
-class SingleUniversityRanklistColumn(IntEnum):
+class SingleUniversityRanklistColumn():
     RANK = 0
     USER = 1
     COUNTRY = 2
     SUBDIVISION = -2
     SCORE = -1
 
-class ChallengeRanklistColumn(IntEnum):
+class ChallengeRanklistColumn():
     RANK = 0
     USER = 1
     COUNTRY = 2
     UNIVERSITY = 3
     CHALLENGE_SCORE = 4
 
-class DefaultRanklistColumn(IntEnum):
+class DefaultRanklistColumn():
     RANK = 0
     USER = 1
     SCORE = 2
 
-class ProblemAuthorsColumn(IntEnum):
+class ProblemAuthorsColumn():
     AUTHOR = 0
     PROBLEMS = 1
     AVG_DIFF = 2
 
-class ProblemSourcesColumn(IntEnum):
+class ProblemSourcesColumn():
     SOURCE = 0
     PROBLEMS = 1
     AVG_DIFF = 2
@@ -2,6 +2,13 @@ from collections import Counter
 from getpass import getpass
 import re
 
+from lxml import etree
+
+from .utils import parse_html
+
+CSRF_REGEX = re.compile(r'value="(\d+)"')
+USER_HREFS_XPATH = etree.XPath('//a[starts-with(@href, "/users/")]/@href', smart_strings=False)
+
 class LoginManager:
     def __init__(self, user):
         self.user = user
@@ -12,7 +19,7 @@ class LoginManager:
 
         # Get CSRF token
         response = self.user.new_get(f'{self.user.get_base_url()}/login/email')
-        regex_result = re.findall(r'value="(\d+)"', response.text)
+        regex_result = CSRF_REGEX.findall(response.text)
         assert len(regex_result) == 1, f'[login] Regex found several or no possible CSRF tokens, {regex_result}'
 
         # Get EduSite cookie + homepage
@@ -24,18 +31,12 @@ class LoginManager:
         response = self.user.new_post(f'{self.user.get_base_url()}/login/email', data=data)
         assert 'login' not in response.url, '[login] Cannot login to Kattis'
 
-        # Reassign username and wrap-up
-        self.user.load_homepage()
-        names = []
-        for a in self.user.get_homepage().find_all('a'):
-            href = a.get('href')
-            if href:
-                paths = href.split('/')
-                if len(paths) > 2 and paths[1] == 'users': names.append(paths[2])
-        ctr = Counter(names)
+        # Reassign username and wrap-up, reusing the page the login redirected to when it is the homepage
+        if response.url.rstrip('/') == self.user.get_base_url(): self.user.set_homepage(parse_html(response.content))
+        else: self.user.load_homepage()
+        ctr = Counter(href.split('/', 3)[2] for href in USER_HREFS_XPATH(self.user.get_homepage()))
         assert ctr, '[login] There are issues when logging in to Kattis, please check your username again'
-        max_freq = max(ctr.values())
-        candidate_usernames = [name for name in ctr if ctr[name] == max_freq]
-        print(f'[login] Candidate username(s): {candidate_usernames}', flush=True)
-        print(f'[login] Successfully logged in to Kattis as {candidate_usernames[0]}!', flush=True)
-        return candidate_usernames[0]
+        username, max_freq = ctr.most_common(1)[0]
+        print(f'[login] Candidate username(s): {[name for name, freq in ctr.items() if freq == max_freq]}', flush=True)
+        print(f'[login] Successfully logged in to Kattis as {username}!', flush=True)
+        return username
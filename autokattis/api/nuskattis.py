@@ -1,32 +1,36 @@
-import io
-import re
-import zipfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
-from bs4 import BeautifulSoup as bs
+from lxml import etree
 
 from . import ABCKattis
 from .enums import (
     ProblemMetadataField, ProblemStatisticsColumn, SolvedProblemsColumn, SubmissionsColumn
 )
 from .utils import (
-    get_last_path, get_table_headers, get_table_rows, guess_id, list_to_tuple,
-    remove_brackets, replace_double_dash, truncate_spaces
+    CATEGORY_OPTIONS_XPATH, CELLS_XPATH, HREFS_XPATH, NUMBER_REGEX, PROBLEM_BODY_XPATH, PROBLEM_CARDS_XPATH,
+    STATISTICS_SECTIONS_XPATH, SUBMISSIONS_TAB_TABLE_XPATH, TABLE2_XPATH, get_last_path, get_tree_rows,
+    guess_id, list_to_tuple, memoize, parse_html, remove_brackets, replace_double_dash, truncate_spaces
 )
 
+ASSIGNMENT_ITEMS_XPATH = etree.XPath('//div[@class="strip-row w-auto"][(.//h2)[1][normalize-space()="Assignments"]]//li')
+
 class NUSKattis(ABCKattis):
-    def __init__(self, username, password=None):
+    def __init__(self, username, password=None, use_cache=False, refresh_database=False):
         '''
         A local NUS Kattis session.
         Takes in a user (email or username).
 
         If the password is not given, you will be prompted for one.
+
+        Set use_cache to True to keep fetched pages in an on-disk cache across sessions (requires requests-cache).
+        Set refresh_database to True to scrape the languages, countries and universities again instead of
+        reusing the copy kept on disk.
         '''
 
-        super().__init__('https://nus.kattis.com', username, password)
+        super().__init__('https://nus.kattis.com', username, password, use_cache, refresh_database)
 
-    @lru_cache
+    @memoize
     def problems(self, show_solved=True):
         '''
         Gets the list of NUS Kattis problems.
@@ -54,62 +58,51 @@ class NUSKattis(ABCKattis):
         ]
         '''
 
-        has_content, data = True, []
-        pid_set = set()
+        # keyed on the problem ID so duplicate rows are dropped with a single lookup
+        data = {}
 
         if show_solved:
+            def parse_page(response):
+                tree = parse_html(response.content)
+                try:                                    table_content = get_tree_rows(SUBMISSIONS_TAB_TABLE_XPATH(tree)[0])
+                except (IndexError, AttributeError):    return []
+
+                rows = []
+                for row in table_content:
+                    columns = CELLS_XPATH(row)
+                    if columns and len(columns) >= SubmissionsColumn.CONTEST_PROBLEM_NAME:
+                        pid = get_last_path(HREFS_XPATH(columns[SubmissionsColumn.CONTEST_PROBLEM_NAME])[-1]) # might have two links if it belongs to a contest, so we take the latter
+                        rows.append({
+                            'name': get_last_path(columns[SubmissionsColumn.CONTEST_PROBLEM_NAME].text_content()),
+                            'id': pid,
+                            'link': f"{self.get_base_url()}/problems/{pid}"
+                        })
+                return rows
+
             params = {
                 'page': 0,
                 'tab': 'submissions',
                 'status': 'AC'
             }
-            with ThreadPoolExecutor(max_workers=self.get_max_workers()) as executor:
-                futures = []
-                while has_content:
-                    has_content = False
-                    futures.clear()
-                    for _ in range(self.get_max_workers()):
-                        futures.append(executor.submit(self.new_get, f'{self.get_base_url()}/users/{self.get_username()}', params=params.copy()))
-                        params['page'] += 1
-                    for f in as_completed(futures):
-                        response = f.result()
-                        soup = bs(response.content, features='lxml')
-                        if not soup: continue
-
-                        table = table = soup.find('div', id='submissions-tab').find('section', class_='strip strip-item-plain').find('table', class_='table2')
-                        try:                    table_content = get_table_rows(table)
-                        except AttributeError:  continue
-
-                        for row in table_content:
-                            columns = row.find_all('td')
-                            if columns and len(columns) >= SubmissionsColumn.CONTEST_PROBLEM_NAME:
-                                has_content = True
-                                pid = get_last_path(columns[SubmissionsColumn.CONTEST_PROBLEM_NAME].find_all('a')[-1].get('href')) # might have two links if it belongs to a contest, so we take the latter
-                                if pid not in pid_set:
-                                    pid_set.add(pid)
-                                    data.append({
-                                        'name': get_last_path(columns[SubmissionsColumn.CONTEST_PROBLEM_NAME].text),
-                                        'id': pid,
-                                        'link': f"{self.get_base_url()}/problems/{pid}"
-                                    })
+            for row in self.paginate(f'{self.get_base_url()}/users/{self.get_username()}', params, parse_page):
+                data.setdefault(row['id'], row)
         else:
             # we can just take from the given dropdown list
-            soup = self.get_soup_response(f'{self.get_base_url()}/users/{self.get_username()}')
-            for option in soup.find_all('option')[1:]:
+            tree = self.get_tree_response(f'{self.get_base_url()}/users/{self.get_username()}')
+            for option in [*tree.iter('option')][1:]:
                 pid = option.get('value').strip()
                 if not pid: break
-                if pid not in pid_set:
-                    pid_set.add(pid)
-                    data.append({
-                        'name': option.text.strip(),
+                if pid not in data:
+                    data[pid] = {
+                        'name': option.text_content().strip(),
                         'id': pid,
                         'link': f"{self.get_base_url()}/problems/{pid}"
-                    })
+                    }
 
-        return self.Result(sorted(data, key=lambda x: x['id']))
+        return self.Result(sorted(data.values(), key=itemgetter('id')))
 
     @list_to_tuple
-    @lru_cache
+    @memoize
     def problem(self, problem_ids, download_files=False, *bc_args):
         '''
         Obtain information about one or more specific problems. The problem_ids parameter can be a string of a single problem ID, or a sequence of problem IDs.
@@ -196,51 +189,50 @@ class NUSKattis(ABCKattis):
         ]
         '''
 
-        ret = []
         if type(problem_ids) == str: problem_ids = [problem_ids]
 
-        for problem_id in {*problem_ids}:
+        def scrape(problem_id):
             original_url = f'{self.get_base_url()}/problems/{problem_id}'
             response = self.new_get(original_url)
 
-            if not response.ok: print(f'[problem] Ignoring {problem_id}'); continue
+            if not response.ok: print(f'[problem] Ignoring {problem_id}'); return None
 
-            soup = bs(response.content, features='lxml')
+            tree = parse_html(response.content)
             if response.url == original_url:
                 dest_urls = []
-                table = soup.find('table', class_='table2')
-                for row in get_table_rows(table):
-                    columns = row.find_all('td')
-                    for column in columns:
-                        if column.find('a'): dest_urls.append(f"{self.get_base_url()}{column.find('a').get('href')}")
-                soup = self.get_soup_response(dest_urls[0])
+                table = TABLE2_XPATH(tree)[0]
+                for row in get_tree_rows(table):
+                    for column in CELLS_XPATH(row):
+                        hrefs = HREFS_XPATH(column)
+                        if hrefs: dest_urls.append(f"{self.get_base_url()}{hrefs[0]}")
+                tree = self.get_tree_response(dest_urls[0])
             else:
                 dest_urls = [response.url]
 
-            body = soup.find('div', class_='problembody')
-            data = {'id': problem_id, 'text': body.text.strip()}
+            # the statistics and the submissions of every offering only need the offering URLs,
+            # so they load while the statement is parsed and its files are downloaded
+            pages = ThreadPoolExecutor(max_workers=len(dest_urls) + 1)
+            statistics_page = pages.submit(self.get_tree_response, f'{dest_urls[0]}/statistics')
+            submissions_pages = [pages.submit(self.get_tree_response, f'{dest_url}?tab=submissions') for dest_url in dest_urls]
+            pages.shutdown(wait=False)
+
+            body = PROBLEM_BODY_XPATH(tree)[0]
+            data = {'id': problem_id, 'text': body.text_content().strip()}
 
             cpu = memory = author = source = ''
             files = {}
-            for div in soup.find_all('div', class_='metadata-grid'):
-                for d in div.find_all('div', class_='card'):
-                    div_text = [s.text.strip() for s in d.find_all('span') if s.text.strip()]
-                    if div_text[0] == ProblemMetadataField.CPU_TIME_LIMIT:
-                        cpu = div_text[-1].strip()
-                    elif div_text[0] == ProblemMetadataField.MEMORY_LIMIT:
-                        memory = div_text[-1].strip()
-                    elif div_text[0] == ProblemMetadataField.SOURCE_LICENSE:
-                        _, author, source, *_ = [s.text for s in d.find_all('span') if not s.find('span')]
-                    elif div_text[0] == ProblemMetadataField.ATTACHMENTS or div_text[0] == ProblemMetadataField.DOWNLOADS:
-                        for url, fn in [(f"{self.get_base_url()}{a.get('href')}", a.get('download') or get_last_path(a.get('href'))) for a in d.find_all('a')]:
-                            if not download_files: continue
-                            if url.endswith('zip'):
-                                with zipfile.ZipFile(io.BytesIO(self.new_get(url).content)) as z:
-                                    files[fn] = {}
-                                    for inner_fn in z.namelist():
-                                        with z.open(inner_fn) as inner_file: files[fn][inner_fn] = inner_file.read().decode("utf-8")
-                            else:
-                                files[fn] = self.new_get(url).text
+            for d in PROBLEM_CARDS_XPATH(tree):
+                div_text = [s.text_content().strip() for s in d.iterfind('.//span') if s.text_content().strip()]
+                if div_text[0] == ProblemMetadataField.CPU_TIME_LIMIT:
+                    cpu = div_text[-1].strip()
+                elif div_text[0] == ProblemMetadataField.MEMORY_LIMIT:
+                    memory = div_text[-1].strip()
+                elif div_text[0] == ProblemMetadataField.SOURCE_LICENSE:
+                    _, author, source, *_ = [s.text_content() for s in d.iterfind('.//span') if s.find('.//span') is None]
+                elif div_text[0] == ProblemMetadataField.ATTACHMENTS or div_text[0] == ProblemMetadataField.DOWNLOADS:
+                    for url, fn in [(f"{self.get_base_url()}{a.get('href')}", a.get('download') or get_last_path(a.get('href'))) for a in d.iterfind('.//a')]:
+                        if not download_files: continue
+                        files[fn] = self.get_zip_response(url) if url.endswith('zip') else self.new_get(url).text
             data = {
                 **data,
                 'cpu': cpu,
@@ -253,38 +245,38 @@ class NUSKattis(ABCKattis):
             # statistics
             # if there are multiple offerings, just take the first one because they share the same leaderboard
             data['statistics'] = {}
-            soup = self.get_soup_response(f'{dest_urls[0]}/statistics')
-            category_map = {option.get('value')[1:]:[option.text, option.get('data-title')] for option in soup.find_all('option')}
-            for section in soup.find_all('section', class_='strip strip-item-plain'):
-                table = section.find('table')
+            tree = statistics_page.result()
+            category_map = {option.get('value')[1:]:[option.text_content(), option.get('data-title')] for option in CATEGORY_OPTIONS_XPATH(tree)}
+            for section in STATISTICS_SECTIONS_XPATH(tree):
+                table = section.find('.//table')
                 section_id = section.get('id')
                 language, description = category_map[section_id]
-                data['statistics'][language] = data['statistics'].get(language, {})
-                data['statistics'][language][['fastest', 'shortest']['shortest' in section_id]] = {}
-                stats = data['statistics'][language][['fastest', 'shortest']['shortest' in section_id]]
-                if table:
+                kind, value_key, value_type = ('shortest', 'length', int) if 'shortest' in section_id else ('fastest', 'runtime', float)
+                stats = {}
+                data['statistics'].setdefault(language, {})[kind] = stats
+                if table is not None:
                     stats['ranklist'] = []
-                    for row in get_table_rows(table):
-                        columns = row.find_all('td')
-                        username_a = columns[ProblemStatisticsColumn.NAME].find('a')
+                    for row in get_tree_rows(table):
+                        columns = CELLS_XPATH(row)
+                        username_hrefs = HREFS_XPATH(columns[ProblemStatisticsColumn.NAME])
                         stats['ranklist'].append({
-                            'rank': int(columns[ProblemStatisticsColumn.RANK].text),
-                            'name': columns[ProblemStatisticsColumn.NAME].text,
-                            'username': get_last_path(username_a.get('href')) if username_a else None,
-                            ['runtime', 'length']['shortest' in section_id]: [float, int]['shortest' in section_id](columns[ProblemStatisticsColumn.RUNTIME_OR_LENGTH].text.split()[0]),
-                            'date': columns[ProblemStatisticsColumn.DATE].text
+                            'rank': int(columns[ProblemStatisticsColumn.RANK].text_content()),
+                            'name': columns[ProblemStatisticsColumn.NAME].text_content(),
+                            'username': get_last_path(username_hrefs[0]) if username_hrefs else None,
+                            value_key: value_type(columns[ProblemStatisticsColumn.RUNTIME_OR_LENGTH].text_content().split()[0]),
+                            'date': columns[ProblemStatisticsColumn.DATE].text_content()
                         })
                 stats['description'] = description
 
             # my submissions
             data['submissions'] = []
-            for dest_url in dest_urls:
-                soup = self.get_soup_response(f'{dest_url}?tab=submissions')
-                table = soup.find('table', id='submissions')
-                if table:
-                    for row in get_table_rows(table):
-                        columns = row.find_all('td')
-                        columns_text = [column.text.strip() for column in columns if column.text.strip()]
+            for submissions_page in submissions_pages:
+                tree = submissions_page.result()
+                table = tree.find('.//table[@id="submissions"]')
+                if table is not None:
+                    for row in get_tree_rows(table):
+                        columns = CELLS_XPATH(row)
+                        columns_text = [text for text in (column.text_content().strip() for column in columns) if text]
                         if columns_text:
                             try:
                                 status, runtime, language, tc, *_ = columns_text
@@ -299,17 +291,21 @@ class NUSKattis(ABCKattis):
                                 'language': language,
                                 'test_case_passed': test_case_passed,
                                 'test_case_full': test_case_full,
-                                'link': f"{self.get_base_url()}{columns[-1].find('a').get('href')}"
+                                'link': f"{self.get_base_url()}{HREFS_XPATH(columns[-1])[0]}"
                             })
 
             # wrap-up
             data['offerings'] = dest_urls
-            ret.append(data)
+            return data
+
+        # problems are independent of each other, so each one goes through its chain of pages on its own thread
+        with ThreadPoolExecutor(max_workers=self.get_max_workers()) as executor:
+            ret = [data for data in executor.map(scrape, {*problem_ids}) if data]
 
         return self.Result(ret)
 
     @list_to_tuple
-    @lru_cache
+    @memoize
     def stats(self, languages=None, *bc_args):
         '''
         Collects the statistics of your accepted (AC) submissions based on the programming language(s) used. The languages parameter can be a string of a single language, or a sequence of languages.
@@ -347,59 +343,62 @@ class NUSKattis(ABCKattis):
         ret = []
         if type(languages) == str: languages = [languages]
 
-        for language in {*languages}:
-            if language and language not in self.get_database().get_languages(): print(f'[stats] Cannot find {language}, language specified must be one of {sorted(self.get_database().get_languages())}'); continue
+        def parse_page(response):
+            tree = parse_html(response.content)
+            table = tree.find('.//table[@class="table2 report_grid-problems_table double-rows"]')
+            rows = []
+            for row in get_tree_rows(table):
+                columns = CELLS_XPATH(row)
+                columns_text = [column.text_content() for column in columns]
+                if any(text.strip() for text in columns_text):
+                    pid = get_last_path(HREFS_XPATH(columns[SubmissionsColumn.CONTEST_PROBLEM_NAME])[-1]) # might have two links if it belongs to a contest
+                    tc_pass, tc_full = map(int, columns_text[SubmissionsColumn.TESTCASES].split('/'))
+
+                    # not converting runtime to float because some TLE solutions (with '>') can also be AC
+                    new_data = {
+                        'name': get_last_path(columns_text[SubmissionsColumn.CONTEST_PROBLEM_NAME]),
+                        'timestamp': columns_text[SubmissionsColumn.SUBMISSION_TIME].strip(),
+                        'runtime': ' '.join(columns_text[SubmissionsColumn.CPU_RUNTIME].split()[:-1]),
+                        'language': columns_text[SubmissionsColumn.PROGRAMMING_LANGUAGE].strip(),
+                        'test_case_passed': tc_pass,
+                        'test_case_full': tc_full,
+                        'link': f"{self.get_base_url()}/submissions/{get_last_path(HREFS_XPATH(columns[SubmissionsColumn.VIEW_DETAILS])[0])}"
+                    }
 
-            has_content = True
+                    pts_match = NUMBER_REGEX.search(columns_text[SubmissionsColumn.STATUS])
+                    if pts_match: new_data['score'] = float(pts_match[0])
+                    rows.append((pid, new_data))
+            return rows
+
+        user_url = f'{self.get_base_url()}/users/{self.get_username()}'
+        def scrape(param_language):
             params = {
                 'page': 0,
                 'status': 'AC',
-                'language': self.get_database().get_languages().get(language)
+                'language': param_language
             }
             data = {}
-            with ThreadPoolExecutor(max_workers=self.get_max_workers()) as executor:
-                futures = []
-                while has_content:
-                    has_content = False
-                    futures.clear()
-                    for _ in range(self.get_max_workers()):
-                        futures.append(executor.submit(self.new_get, f'{self.get_base_url()}/users/{self.get_username()}', params=params.copy()))
-                        params['page'] += 1
-                    for f in as_completed(futures):
-                        response = f.result()
-                        soup = bs(response.content, features='lxml')
-                        table = soup.find('table', class_='table2 report_grid-problems_table double-rows')
-                        for row in get_table_rows(table):
-                            columns = row.find_all('td')
-                            if [column.text.strip() for column in columns if column.text.strip()]:
-                                has_content = True
-                                pid = get_last_path(columns[SubmissionsColumn.CONTEST_PROBLEM_NAME].find_all('a')[-1].get('href')) # might have two links if it belongs to a contest
-                                tc_pass, tc_full = map(int, columns[SubmissionsColumn.TESTCASES].text.split('/'))
-
-                                # not converting runtime to float because some TLE solutions (with '>') can also be AC
-                                new_data = {
-                                    'name': get_last_path(columns[SubmissionsColumn.CONTEST_PROBLEM_NAME].text),
-                                    'timestamp': columns[SubmissionsColumn.SUBMISSION_TIME].text.strip(),
-                                    'runtime': ' '.join(columns[SubmissionsColumn.CPU_RUNTIME].text.split()[:-1]),
-                                    'language': columns[SubmissionsColumn.PROGRAMMING_LANGUAGE].text.strip(),
-                                    'test_case_passed': tc_pass,
-                                    'test_case_full': tc_full,
-                                    'link': f"{self.get_base_url()}/submissions/{get_last_path(columns[SubmissionsColumn.VIEW_DETAILS].find('a').get('href'))}"
-                                }
-
-                                pts_regex = re.findall(r'[\d\.]+', columns[SubmissionsColumn.STATUS].text)
-                                if pts_regex: new_data['score'] = float(pts_regex[0])
-                                data[pid] = new_data if pid not in data else max(
-                                    data[pid], new_data,
-                                    key=lambda x: (x.get('score', tc_pass/tc_full), x['test_case_passed'], -float(x['runtime'] if '>' not in x['runtime'] else 1e9))
-                                )
+            for pid, new_data in self.paginate(user_url, params, parse_page):
+                tc_pass, tc_full = new_data['test_case_passed'], new_data['test_case_full']
+                data[pid] = new_data if pid not in data else max(
+                    data[pid], new_data,
+                    key=lambda x: (x.get('score', tc_pass/tc_full), x['test_case_passed'], -float(x['runtime'] if '>' not in x['runtime'] else 1e9))
+                )
+            return [{'id': k, **v} for k, v in data.items()]
+
+        # a language name and its code (e.g. 'C++' and 'cpp') map to the same filter, so only scrape it once
+        param_languages, languages_map = set(), self.get_database().get_languages()
+        for language in {*languages}:
+            if language and language not in languages_map: print(f'[stats] Cannot find {language}, language specified must be one of {sorted(languages_map)}'); continue
+            param_languages.add(languages_map.get(language))
 
-            # wrap-up
-            ret.extend({'id': k, **v} for k, v in data.items())
+        # every language is paginated at the same time
+        with ThreadPoolExecutor(max_workers=self.get_max_workers()) as executor:
+            for rows in executor.map(scrape, param_languages): ret.extend(rows)
 
-        return self.Result(sorted(ret, key=lambda x: x['id']))
+        return self.Result(sorted(ret, key=itemgetter('id')))
 
-    @lru_cache
+    @memoize
     def courses(self):
         '''
         Lists down only the current courses offered and the courses with recently ended offerings in NUS Kattis.
@@ -420,24 +419,24 @@ class NUSKattis(ABCKattis):
         ]
         '''
 
-        tables = self.get_homepage().find_all('table', class_='table2')
+        tables = TABLE2_XPATH(self.get_homepage())
         if not tables: return self.Result([])
-        data = []
+        data, base_url = [], self.get_base_url()
         for table in tables:
-            for row in table.find_all('tr'):
-                columns = row.find_all('td')
-                columns_text = [truncate_spaces(column.text.strip()) for column in columns]
-                columns_url = [column.find('a') for column in columns]
+            for row in table.iter('tr'):
+                columns = CELLS_XPATH(row)
+                columns_text = [truncate_spaces(column.text_content().strip()) for column in columns]
+                columns_url = [column.find('.//a') for column in columns]
                 if columns_text:
                     href = columns_url[0].get('href')
                     data.append({
                         'name': columns_text[0],
-                        'url': self.get_base_url() + href,
+                        'url': base_url + href,
                         'course_id': get_last_path(href)
                     })
-        return self.Result(sorted(data, key=lambda r: r['course_id']))
+        return self.Result(sorted(data, key=itemgetter('course_id')))
 
-    @lru_cache
+    @memoize
     def offerings(self, course_id):
         '''
         Lists down all offerings within a specific NUS Kattis course.
@@ -457,25 +456,36 @@ class NUSKattis(ABCKattis):
         ]
         '''
 
-        soup = self.get_soup_response(f'{self.get_base_url()}/courses/{course_id}')
-        table = soup.find('table', class_='table2')
-        if not table: return self.Result([])
-        data = []
-        for row in table.tbody.find_all('tr'):
-            columns = row.find_all('td')
+        tree = self.get_tree_response(f'{self.get_base_url()}/courses/{course_id}')
+        try:                table = TABLE2_XPATH(tree)[0]
+        except IndexError:  return self.Result([])
+        data, base_url = [], self.get_base_url()
+        for row in get_tree_rows(table):
+            columns = CELLS_XPATH(row)
             try:
-                name, end_date = [truncate_spaces(column.text.strip()) for column in columns]
-                link, _ = [column.find('a') for column in columns]
+                name, end_date = [truncate_spaces(column.text_content().strip()) for column in columns]
+                link, _ = [column.find('.//a') for column in columns]
                 data.append({
                     'name': name.replace('\n', ''),
                     'end_date': end_date.split()[1][:-1],
-                    'link': self.get_base_url() + link.get('href')
+                    'link': base_url + link.get('href')
                 })
             except:
                 pass # ignore for now
-        return self.Result(sorted(data, key=lambda r: r['end_date'], reverse=True))
-
-    @lru_cache
+        return self.Result(sorted(data, key=itemgetter('end_date'), reverse=True))
+
+    @memoize
+    def _get_offering_courses(self):
+        # every offering name mapped to the first course (in course order) that lists it,
+        # with the offerings of all courses fetched concurrently
+        course_ids = [course['course_id'] for course in self.courses()]
+        offering_courses = {}
+        with ThreadPoolExecutor(max_workers=self.get_max_workers()) as executor:
+            for course_id, offerings in zip(course_ids, executor.map(self.offerings, course_ids)):
+                for offering in offerings: offering_courses.setdefault(offering['name'], course_id)
+        return offering_courses
+
+    @memoize
     def assignments(self, offering_id, course_id=None):
         '''
         Lists down all assignments within a specific NUS Kattis course offering.
@@ -502,41 +512,25 @@ class NUSKattis(ABCKattis):
 
         if course_id == None:
             # try to guess
-            for cid in self.courses().to_df().course_id:
-                if offering_id in [*self.offerings(cid).to_df().name]: course_id = cid; break
+            course_id = self._get_offering_courses().get(offering_id)
             assert course_id != None, '[assignments] Cannot guess course ID automatically, please provide one'
             print('[assignments] Guessed course ID:', course_id, flush=True)
 
-        soup = self.get_soup_response(f'{self.get_base_url()}/courses/{course_id}/{offering_id}')
-        data = []
-        for div in soup.find_all('div', {'class': 'strip-row w-auto'}):
-            h2 = div.find('h2')
-            if h2 != None and h2.text.strip() == 'Assignments':
-                toggle = False
-                for asg in div.find_all('li'):
-                    if asg.find('span') == None:
-                        if toggle:
-                            data.append({
-                                'id': aid,
-                                'name': name,
-                                'status': status,
-                                'link': link,
-                                'problems': ','.join(pids)
-                            })
-                        name, status = truncate_spaces(asg.text.strip()).split('\n')
-                        status = remove_brackets(status)
-                        link = self.get_base_url() + asg.find('a').get('href')
-                        aid = get_last_path(link)
-                        pids = []
-                        toggle = True
-                    else:
-                        pids.append(get_last_path(asg.find('a').get('href')))
-                if toggle:
-                    data.append({
-                        'id': aid,
-                        'name': name,
-                        'status': status,
-                        'link': link,
-                        'problems': ','.join(pids)
-                    })
+        tree = self.get_tree_response(f'{self.get_base_url()}/courses/{course_id}/{offering_id}')
+        data, base_url = [], self.get_base_url()
+        for item in ASSIGNMENT_ITEMS_XPATH(tree):
+            href = item.find('.//a').get('href')
+            if item.find('.//span') is None:
+                # an assignment, followed by the items of its problems
+                name, status = truncate_spaces(item.text_content().strip()).split('\n')
+                data.append({
+                    'id': get_last_path(href),
+                    'name': name,
+                    'status': remove_brackets(status),
+                    'link': base_url + href,
+                    'problems': []
+                })
+            else:
+                data[-1]['problems'].append(get_last_path(href))
+        for assignment in data: assignment['problems'] = ','.join(assignment['problems'])
         return self.Result(data)
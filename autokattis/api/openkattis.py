@@ -1,13 +1,9 @@
-import io
 import math
-import re
-import zipfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
-from bs4 import BeautifulSoup as bs
+from lxml import etree
 import matplotlib.pyplot as plt
-import pandas as pd
 import seaborn as sns
 
 from . import ABCKattis
@@ -18,22 +14,37 @@ from .enums import (
     SolvedProblemsColumn, SubmissionsColumn, UniversityRanklistColumn, UserRanklistColumn
 )
 from .utils import (
-    get_last_path, get_table_headers, get_table_rows, guess_id,
-    list_to_tuple, replace_double_dash
+    CATEGORY_OPTIONS_XPATH, CELLS_XPATH, HREFS_XPATH, NUMBER_REGEX, PROBLEM_BODY_XPATH, PROBLEM_CARDS_XPATH,
+    STATISTICS_SECTIONS_XPATH, SUBMISSIONS_TAB_TABLE_XPATH, TABLE2_XPATH, WORD_REGEX, get_last_path,
+    get_tree_headers, get_tree_rows, guess_id, list_to_tuple, memoize, parse_html, replace_double_dash
 )
 
+PROBLEMS_TABLE_XPATH = etree.XPath('(//section[@class="strip strip-item-plain"])[1]//table[contains(concat(" ", @class, " "), " table2 ")]')
+GRID_TABLES_XPATH = etree.XPath('//table[@class="table2 report_grid-problems_table"]')
+TOP_USERS_TABLE_XPATH = etree.XPath('//table[@id="top_users"][@class="table2 report_grid-problems_table"]')
+
+# where the code and title of each kind of link in the homepage ranklist go
+RANKLIST_LINK_FIELDS = {
+    'users': ('username', None),
+    'universities': ('university_code', 'university'),
+    'countries': ('country_code', 'country')
+}
+
 class OpenKattis(ABCKattis):
-    def __init__(self, username, password=None):
+    def __init__(self, username, password=None, use_cache=False, refresh_database=False):
         '''
         A local Open Kattis session.
         Takes in a user (email or username).
 
         If the password is not given, you will be prompted for one.
+
+        Set use_cache to True to keep fetched pages in an on-disk cache across sessions (requires requests-cache).
+        Set refresh_database to True to scrape the languages, countries and universities again instead of
+        reusing the copy kept on disk.
         '''
 
-        super().__init__('https://open.kattis.com', username, password)
+        super().__init__('https://open.kattis.com', username, password, use_cache, refresh_database)
 
-    @lru_cache
     def problems(self, show_solved=True, show_partial=True, show_tried=False, show_untried=False, low_detail_mode=False):
         '''
         Gets the list of Open Kattis problems.
@@ -93,61 +104,93 @@ class OpenKattis(ABCKattis):
         ]
         '''
 
-        has_content, data = True, []
+        # keyed on the normalized flags so positional, keyword and truthy calls all share one crawl
+        key = ('problems', *map(bool, (show_solved, show_partial, show_tried, show_untried, low_detail_mode)))
+        if key in self.memo: return self.memo[key]
+
+        data = []
 
         if low_detail_mode:
             pid_set = set()
 
             if show_solved:
+                def parse_page(response):
+                    tree = parse_html(response.content)
+
+                    try:                table = SUBMISSIONS_TAB_TABLE_XPATH(tree)[0]
+                    except IndexError:  return []
+                    try:                    table_content = get_tree_rows(table)
+                    except AttributeError:  return []
+
+                    rows = []
+                    for row in table_content:
+                        columns = CELLS_XPATH(row)
+                        if columns and len(columns) >= SubmissionsColumn.CONTEST_PROBLEM_NAME:
+                            pid = get_last_path(HREFS_XPATH(columns[SubmissionsColumn.CONTEST_PROBLEM_NAME])[-1]) # might have two links if it belongs to a contest, so we take the latter
+                            rows.append({
+                                'name': get_last_path(columns[SubmissionsColumn.CONTEST_PROBLEM_NAME].text_content()),
+                                'id': pid,
+                                'link': f"{self.get_base_url()}/problems/{pid}"
+                            })
+                    return rows
+
                 params = {
                     'page': 0,
                     'tab': 'submissions',
                     'status': 'AC'
                 }
-
-                with ThreadPoolExecutor(max_workers=self.get_max_workers()) as executor:
-                    futures = []
-                    while has_content:
-                        has_content = False
-                        futures.clear()
-                        for _ in range(self.get_max_workers()):
-                            futures.append(executor.submit(self.new_get, f'{self.get_base_url()}/users/{self.get_username()}', params=params.copy()))
-                            params['page'] += 1
-                        for f in as_completed(futures):
-                            response = f.result()
-                            soup = bs(response.content, features='lxml')
-                            if not soup: continue
-
-                            table = table = soup.find('div', id='submissions-tab').find('section', class_='strip strip-item-plain').find('table', class_='table2')
-                            try:                    table_content = get_table_rows(table)
-                            except AttributeError:  continue
-
-                            for row in table_content:
-                                columns = row.find_all('td')
-                                if columns and len(columns) >= SubmissionsColumn.CONTEST_PROBLEM_NAME:
-                                    has_content = True
-                                    pid = get_last_path(columns[SubmissionsColumn.CONTEST_PROBLEM_NAME].find_all('a')[-1].get('href')) # might have two links if it belongs to a contest, so we take the latter
-                                    if pid not in pid_set:
-                                        pid_set.add(pid)
-                                        data.append({
-                                            'name': get_last_path(columns[SubmissionsColumn.CONTEST_PROBLEM_NAME].text),
-                                            'id': pid,
-                                            'link': f"{self.get_base_url()}/problems/{pid}"
-                                        })
+                for row in self.paginate(f'{self.get_base_url()}/users/{self.get_username()}', params, parse_page):
+                    if row['id'] not in pid_set:
+                        pid_set.add(row['id'])
+                        data.append(row)
             else:
                 # we can just take from the given dropdown list
-                soup = self.get_soup_response(f'{self.get_base_url()}/users/{self.get_username()}')
-                for option in soup.find_all('option')[1:]:
+                tree = self.get_tree_response(f'{self.get_base_url()}/users/{self.get_username()}')
+                for option in tree.xpath('//option')[1:]:
                     pid = option.get('value').strip()
                     if not pid: break
                     if pid not in pid_set:
                         pid_set.add(pid)
                         data.append({
-                            'name': option.text.strip(),
+                            'name': option.text_content().strip(),
                             'id': pid,
                             'link': f"{self.get_base_url()}/problems/{pid}"
                         })
         else:
+            def parse_page(response):
+                tree = parse_html(response.content)
+
+                try:                table = PROBLEMS_TABLE_XPATH(tree)[0]
+                except IndexError:  return [] # end of page (no data found)
+                try:                    table_content = get_tree_rows(table)
+                except AttributeError:  return [] # nothing to see
+
+                rows = []
+                for row in table_content:
+                    columns = CELLS_XPATH(row)
+                    if columns:
+                        link = f"{self.get_base_url()}{HREFS_XPATH(columns[ProblemsColumn.PROBLEM_NAME])[0]}"
+                        difficulty_text = columns[ProblemsColumn.DIFFICULTY_CATEGORY].text_content()
+                        difficulty = float((NUMBER_REGEX.findall(difficulty_text) or [None])[-1])
+                            # [0] instead of [-1] if we want to take min instead of max
+                            # for example:
+                            # - difficulty 9.1-9.6 -> [9.1, 9.6]
+                            # - difficulty 5.0 -> [5.0]
+                        try:    category = (WORD_REGEX.findall(difficulty_text) or ['N/A'])[0]
+                        except: category = 'N/A'
+                        rows.append({
+                            'name': columns[ProblemsColumn.PROBLEM_NAME].text_content().strip(),
+                            'id': get_last_path(link),
+                            'fastest': replace_double_dash(columns[ProblemsColumn.FASTEST_RUNTIME].text_content(), float('inf')),
+                            'shortest': replace_double_dash(columns[ProblemsColumn.SHORTEST_LENGTH].text_content(), -1),
+                            'total': int(columns[ProblemsColumn.N_SUBMISSIONS].text_content()),
+                            'acc': int(columns[ProblemsColumn.N_ACC].text_content()),
+                            'difficulty': difficulty,
+                            'category': category,
+                            'link': link
+                        })
+                return rows
+
             params = {
                 'page': 1,
                 'f_solved': ['off', 'on'][show_solved],
@@ -155,50 +198,10 @@ class OpenKattis(ABCKattis):
                 'f_tried': ['off', 'on'][show_tried],
                 'f_untried': ['off', 'on'][show_untried]
             }
+            data = self.paginate(f'{self.get_base_url()}/problems', params, parse_page)
+        self.memo[key] = self.Result(sorted(data, key=itemgetter('id')))
+        return self.memo[key]
 
-            with ThreadPoolExecutor(max_workers=self.get_max_workers()) as executor:
-                futures = []
-                while has_content:
-                    has_content = False
-                    futures.clear()
-                    for _ in range(self.get_max_workers()):
-                        futures.append(executor.submit(self.new_get, f'{self.get_base_url()}/problems', params=params.copy()))
-                        params['page'] += 1
-                    for f in as_completed(futures):
-                        soup = bs(f.result().content, features='lxml')
-                        if not soup: continue
-
-                        try:                    table = soup.find('section', class_='strip strip-item-plain').find('table', class_='table2')
-                        except AttributeError:  continue # end of page (no data found)
-                        try:                    table_content = get_table_rows(table)
-                        except AttributeError:  continue # nothing to see
-
-                        for row in table_content:
-                            columns = row.find_all('td')
-                            if columns:
-                                has_content = True
-                                link = f"{self.get_base_url()}{columns[ProblemsColumn.PROBLEM_NAME].find('a').get('href')}"
-                                difficulty = float((re.findall('[\d\.]+', columns[ProblemsColumn.DIFFICULTY_CATEGORY].text) or [None])[-1])
-                                    # [0] instead of [-1] if we want to take min instead of max
-                                    # for example:
-                                    # - difficulty 9.1-9.6 -> [9.1, 9.6]
-                                    # - difficulty 5.0 -> [5.0]
-                                try:    category = (re.findall('[A-Za-z]+', columns[ProblemsColumn.DIFFICULTY_CATEGORY].text) or ['N/A'])[0]
-                                except: category = 'N/A'
-                                data.append({
-                                    'name': columns[ProblemsColumn.PROBLEM_NAME].text.strip(),
-                                    'id': get_last_path(link),
-                                    'fastest': replace_double_dash(columns[ProblemsColumn.FASTEST_RUNTIME].text, float('inf')),
-                                    'shortest': replace_double_dash(columns[ProblemsColumn.SHORTEST_LENGTH].text, -1),
-                                    'total': int(columns[ProblemsColumn.N_SUBMISSIONS].text),
-                                    'acc': int(columns[ProblemsColumn.N_ACC].text),
-                                    'difficulty': difficulty,
-                                    'category': category,
-                                    'link': link
-                                })
-        return self.Result(sorted(data, key=lambda x: x['id']))
-
-    @lru_cache
     def plot_problems(self, filepath=None, show_solved=True, show_partial=True, show_tried=False, show_untried=False):
         '''
         Plots the histogram of Kattis problems by difficulty points to a specified filepath, if any.
@@ -207,14 +210,15 @@ class OpenKattis(ABCKattis):
         '''
         enum_to_title = lambda c: c.name.replace('_', '/').title()
 
-        df = pd.DataFrame(self.problems(show_solved, show_partial, show_tried, show_untried))
+        df = self.problems(show_solved, show_partial, show_tried, show_untried).to_df()
         categories = set(df.category)
 
         hue_order = [enum_to_title(c) for c in [DifficultyColor.N_A, DifficultyColor.HARD, DifficultyColor.MEDIUM, DifficultyColor.EASY] if enum_to_title(c) in categories]
         palette = {enum_to_title(c):c.value for c in [DifficultyColor.EASY, DifficultyColor.MEDIUM, DifficultyColor.HARD, DifficultyColor.N_A] if enum_to_title(c) in categories}
 
-        diff_lo = math.floor(min([d for d in df.difficulty if d], default=0))
-        diff_hi = math.ceil(max([d for d in df.difficulty if d], default=0))
+        difficulties = df.difficulty.astype(float)
+        difficulties = difficulties[difficulties > 0]
+        diff_lo, diff_hi = (math.floor(difficulties.min()), math.ceil(difficulties.max())) if not difficulties.empty else (0, 0)
 
         plt.clf()
         hist = sns.histplot(data=df, x='difficulty', hue='category', multiple='stack', bins=[i/10 for i in range(10*diff_lo, 10*diff_hi+1)], hue_order=hue_order, palette=palette)
@@ -227,13 +231,14 @@ class OpenKattis(ABCKattis):
         plt.show()
 
     @list_to_tuple
-    @lru_cache
-    def problem(self, problem_ids, download_files=False, *bc_args):
+    def problem(self, problem_ids, download_files=False, *bc_args, with_statistics=True, with_submissions=True):
         '''
         Obtain information about one or more specific problems. The problem_ids parameter can be a string of a single problem ID, or a sequence of problem IDs.
 
         By default, all files, including the sample test cases, will not be downloaded within the result metadata.
 
+        Set with_statistics or with_submissions to False to skip fetching the statistics or your submissions respectively, in which case the corresponding key is left out.
+
         Example:
         [
             {
@@ -299,113 +304,127 @@ class OpenKattis(ABCKattis):
         ret = []
         if type(problem_ids) == str: problem_ids = [problem_ids]
 
-        for problem_id in {*problem_ids}:
-            response = self.new_get(f'{self.get_base_url()}/problems/{problem_id}')
-
-            if not response.ok: print(f'[problem] Ignoring {problem_id}'); continue
+        # each problem is cached on its own, so overlapping calls only fetch the ids not seen yet
+        key = lambda problem_id: ('problem', problem_id, bool(download_files), bool(with_statistics), bool(with_submissions))
+        problem_ids = [*dict.fromkeys(problem_ids)]
 
-            soup = bs(response.content, features='lxml')
-            body = soup.find('div', class_='problembody')
-            data = {'id': problem_id, 'text': body.text.strip()}
-
-            cpu = memory = author = source = ''
-            difficulty, category, files = None, 'N/A', {}
-            for div in soup.find_all('div', class_='metadata-grid'):
-                for d in div.find_all('div', class_='card'):
-                    div_text = [s.text.strip() for s in d.find_all('span') if s.text.strip()]
+        with ThreadPoolExecutor(max_workers=self.get_max_workers()) as executor:
+            # request the description, statistics and submissions of every problem up front, skipping what is not wanted;
+            # the description is kept as a response to check its status, the other two are parsed as they stream in
+            pages = {problem_id: [executor.submit(fetch, url) if wanted else None for url, fetch, wanted in (
+                (f'{self.get_base_url()}/problems/{problem_id}', self.new_get, True),
+                (f'{self.get_base_url()}/problems/{problem_id}/statistics', self.get_tree_response, with_statistics),
+                (f'{self.get_base_url()}/problems/{problem_id}?tab=submissions', self.get_tree_response, with_submissions)
+            )] for problem_id in problem_ids if key(problem_id) not in self.memo}
+
+            for problem_id, (response, statistics_response, submissions_response) in pages.items():
+                response = response.result()
+
+                if not response.ok: print(f'[problem] Ignoring {problem_id}'); continue
+
+                tree = parse_html(response.content)
+                body = PROBLEM_BODY_XPATH(tree)[0]
+                data = {'id': problem_id, 'text': body.text_content().strip()}
+
+                cpu = memory = author = source = ''
+                difficulty, category, files = None, 'N/A', {}
+                for d in PROBLEM_CARDS_XPATH(tree):
+                    div_text = [s.text_content().strip() for s in d.iterfind('.//span') if s.text_content().strip()]
                     if div_text[0] == ProblemMetadataField.CPU_TIME_LIMIT:
                         cpu = div_text[-1].strip()
                     elif div_text[0] == ProblemMetadataField.MEMORY_LIMIT:
                         memory = div_text[-1].strip()
                     elif len(div_text) > 1 and div_text[1] == ProblemMetadataField.DIFFICULTY:
-                        difficulty = float((re.findall('[\d\.]+', columns[ProblemsColumn.DIFFICULTY_CATEGORY].text) or [None])[-1])
+                        difficulty = float((NUMBER_REGEX.findall(div_text[0]) or [None])[-1])
                                     # [0] instead of [-1] if we want to take min instead of max
                                     # for example:
                                     # - difficulty 9.1-9.6 -> [9.1, 9.6]
                                     # - difficulty 5.0 -> [5.0]
                         category = div_text[2].strip() if len(div_text) > 2 else 'N/A'
                     elif div_text[0] == ProblemMetadataField.SOURCE_LICENSE:
-                        text_links = [(s.text.strip(), [a.get('href').strip('/') for a in s.find_all('a')]) for s in d.find_all('span') if s.text.strip()]
+                        text_links = [(s.text_content().strip(), [href.strip('/') for href in HREFS_XPATH(s)]) for s in d.iterfind('.//span') if s.text_content().strip()]
                         for text, links in text_links:
                             if any(link.startswith('problem-authors') for link in links): author = text
                             if any(link.startswith('problem-sources') for link in links): source = text
                     elif div_text[0] == ProblemMetadataField.ATTACHMENTS or div_text[0] == ProblemMetadataField.DOWNLOADS:
                         if not download_files: continue
-                        for url, fn in [(f"{self.get_base_url()}{a.get('href')}", a.get('download') or get_last_path(a.get('href'))) for a in d.find_all('a')]:
-                            if url.endswith('zip'):
-                                with zipfile.ZipFile(io.BytesIO(self.new_get(url).content)) as z:
-                                    files[fn] = {}
-                                    for inner_fn in z.namelist():
-                                        with z.open(inner_fn) as inner_file: files[fn][inner_fn] = inner_file.read().decode("utf-8")
-                            else:
-                                files[fn] = self.new_get(url).text
-            data = {
-                **data,
-                'cpu': cpu,
-                'memory': memory,
-                'difficulty': difficulty,
-                'category': category,
-                'author': author,
-                'source': source,
-                'files': files
-            }
+                        links = [(f"{self.get_base_url()}{a.get('href')}", a.get('download') or get_last_path(a.get('href'))) for a in d.iterfind('.//a')]
+                        for url, fn in links:
+                            # collected once every problem has been parsed, so all attachments download together
+                            files[fn] = executor.submit(self.get_zip_response if url.endswith('zip') else lambda url: self.new_get(url).text, url)
+                data = {
+                    **data,
+                    'cpu': cpu,
+                    'memory': memory,
+                    'difficulty': difficulty,
+                    'category': category,
+                    'author': author,
+                    'source': source,
+                    'files': files
+                }
 
-            # statistics
-            data['statistics'] = {}
-            soup = self.get_soup_response(f'{self.get_base_url()}/problems/{problem_id}/statistics')
-            category_map = {option.get('value')[1:]:[option.text, option.get('data-title')] for option in soup.find_all('option')}
-            for section in soup.find_all('section', class_='strip strip-item-plain'):
-                table = section.find('table')
-                section_id = section.get('id')
-                language, description = category_map[section_id]
-                data['statistics'][language] = data['statistics'].get(language, {})
-                data['statistics'][language][['fastest', 'shortest']['shortest' in section_id]] = {}
-                stats = data['statistics'][language][['fastest', 'shortest']['shortest' in section_id]]
-                if table:
-                    stats['ranklist'] = []
-                    for row in get_table_rows(table):
-                        columns = row.find_all('td')
-                        username_a = columns[ProblemStatisticsColumn.NAME].find('a')
-                        stats['ranklist'].append({
-                            'rank': int(columns[ProblemStatisticsColumn.RANK].text),
-                            'name': columns[ProblemStatisticsColumn.NAME].text,
-                            'username': get_last_path(username_a.get('href')) if username_a else None,
-                            ['runtime', 'length']['shortest' in section_id]: [float, int]['shortest' in section_id](columns[ProblemStatisticsColumn.RUNTIME_OR_LENGTH].text.split()[0]),
-                            'date': columns[ProblemStatisticsColumn.DATE].text
-                        })
-                stats['description'] = description
-
-            # my submissions
-            data['submissions'] = []
-            soup = self.get_soup_response(f'{self.get_base_url()}/problems/{problem_id}?tab=submissions')
-            table = soup.find('table', id='submissions')
-            if table:
-                for row in get_table_rows(table):
-                    columns = row.find_all('td')
-                    columns_text = [column.text.strip() for column in columns if column.text.strip()]
-                    if columns_text:
-                        try:
-                            status, runtime, language, tc, *_ = columns_text
-                            runtime = ' '.join(runtime.split())
-                            test_case_passed, test_case_full = map(int, tc.split('/'))
-                        except:
-                            status, language, *_ = columns_text
-                            runtime = test_case_passed = test_case_full = None
-                        data['submissions'].append({
-                            'status': status,
-                            'runtime': runtime,
-                            'language': language,
-                            'test_case_passed': test_case_passed,
-                            'test_case_full': test_case_full,
-                            'link': f"{self.get_base_url()}{columns[-1].find('a').get('href')}"
-                        })
+                # statistics
+                if statistics_response is not None:
+                    data['statistics'] = {}
+                    tree = statistics_response.result()
+                    category_map = {option.get('value')[1:]:[option.text_content(), option.get('data-title')] for option in CATEGORY_OPTIONS_XPATH(tree)}
+                    for section in STATISTICS_SECTIONS_XPATH(tree):
+                        table = section.find('.//table')
+                        section_id = section.get('id')
+                        language, description = category_map[section_id]
+                        kind, value_key, value_type = ('shortest', 'length', int) if 'shortest' in section_id else ('fastest', 'runtime', float)
+                        stats = {}
+                        data['statistics'].setdefault(language, {})[kind] = stats
+                        if table is not None:
+                            stats['ranklist'] = []
+                            for row in get_tree_rows(table):
+                                columns = CELLS_XPATH(row)
+                                username_hrefs = HREFS_XPATH(columns[ProblemStatisticsColumn.NAME])
+                                stats['ranklist'].append({
+                                    'rank': int(columns[ProblemStatisticsColumn.RANK].text_content()),
+                                    'name': columns[ProblemStatisticsColumn.NAME].text_content(),
+                                    'username': get_last_path(username_hrefs[0]) if username_hrefs else None,
+                                    value_key: value_type(columns[ProblemStatisticsColumn.RUNTIME_OR_LENGTH].text_content().split()[0]),
+                                    'date': columns[ProblemStatisticsColumn.DATE].text_content()
+                                })
+                        stats['description'] = description
+
+                # my submissions
+                if submissions_response is not None:
+                    data['submissions'] = []
+                    tree = submissions_response.result()
+                    table = tree.find('.//table[@id="submissions"]')
+                    if table is not None:
+                        for row in get_tree_rows(table):
+                            columns = CELLS_XPATH(row)
+                            columns_text = [text for text in (column.text_content().strip() for column in columns) if text]
+                            if columns_text:
+                                try:
+                                    status, runtime, language, tc, *_ = columns_text
+                                    runtime = ' '.join(runtime.split())
+                                    test_case_passed, test_case_full = map(int, tc.split('/'))
+                                except:
+                                    status, language, *_ = columns_text
+                                    runtime = test_case_passed = test_case_full = None
+                                data['submissions'].append({
+                                    'status': status,
+                                    'runtime': runtime,
+                                    'language': language,
+                                    'test_case_passed': test_case_passed,
+                                    'test_case_full': test_case_full,
+                                    'link': f"{self.get_base_url()}{HREFS_XPATH(columns[-1])[0]}"
+                                })
 
-            # wrap-up
-            ret.append(data)
+                # wrap-up
+                ret.append(data)
 
-        return self.Result(ret)
+            for data in ret:
+                data['files'] = {fn: download.result() for fn, download in data['files'].items()}
+                self.memo[key(data['id'])] = data
 
-    @lru_cache
+        return self.Result([self.memo[key(problem_id)] for problem_id in problem_ids if key(problem_id) in self.memo])
+
+    @memoize
     def achievements(self):
         '''
         Lists down all your Kattis achievements. Flex it!
@@ -426,46 +445,41 @@ class OpenKattis(ABCKattis):
         ]
         '''
 
-        has_content, params, data = True, {'page': 1}, []
-
-        with ThreadPoolExecutor(max_workers=self.get_max_workers()) as executor:
-            futures = []
-            while has_content:
-                has_content = False
-                futures.clear()
-                for _ in range(self.get_max_workers()):
-                    futures.append(executor.submit(self.new_get, f'{self.get_base_url()}/users/{self.get_username()}', params=params.copy()))
-                    params['page'] += 1
-                for f in as_completed(futures):
-                    response = f.result()
-                    soup = bs(response.content, features='lxml')
-                    table = soup.find('table', class_='table2')
-                    for row in get_table_rows(table):
-                        columns = row.find_all('td')
-                        if [column.text.strip() for column in columns if column.text.strip()]:
-                            if columns[SolvedProblemsColumn.NAME].find('a') == None: continue
-                            has_content = True
-                            link = f"{self.get_base_url()}{columns[SolvedProblemsColumn.NAME].find('a').get('href')}"
-                            achievement = ', '.join(sorted(set(sp.text.strip() for sp in columns[SolvedProblemsColumn.ACHIEVEMENTS].find_all('span') if len(sp.find_all('span')) == 1)))
-                            if not achievement: continue
-                            try:        difficulty = float(re.findall('[\d\.]+', columns[SolvedProblemsColumn.DIFFICULTY].text)[-1])
-                            except:     difficulty = None
-                            try:        category = re.findall('[A-Za-z]+', columns[SolvedProblemsColumn.DIFFICULTY].text)[0]
-                            except:     category = 'N/A'
-                            data.append({
-                                'name': columns[SolvedProblemsColumn.NAME].text,
-                                'id': get_last_path(link),
-                                'runtime': replace_double_dash(columns[SolvedProblemsColumn.CPU_RUNTIME].text, float('inf')),
-                                'length': replace_double_dash(columns[SolvedProblemsColumn.LENGTH].text, -1),
-                                'achievement': achievement,
-                                'difficulty': difficulty,
-                                'category': category,
-                                'link': link
-                            })
-        return self.Result(sorted(data, key=lambda x: x['id']))
+        def parse_page(response):
+            tree = parse_html(response.content)
+            try:                table = TABLE2_XPATH(tree)[0]
+            except IndexError:  return []
+            rows = []
+            for row in get_tree_rows(table):
+                columns = CELLS_XPATH(row)
+                if any(column.text_content().strip() for column in columns):
+                    hrefs = HREFS_XPATH(columns[SolvedProblemsColumn.NAME])
+                    if not hrefs: continue
+                    link = f"{self.get_base_url()}{hrefs[0]}"
+                    achievement = ', '.join(sorted(set(sp.text_content().strip() for sp in columns[SolvedProblemsColumn.ACHIEVEMENTS].iterfind('.//span') if len(sp.findall('.//span')) == 1)))
+                    difficulty_text = columns[SolvedProblemsColumn.DIFFICULTY].text_content()
+                    try:        difficulty = float(NUMBER_REGEX.findall(difficulty_text)[-1])
+                    except:     difficulty = None
+                    try:        category = WORD_REGEX.findall(difficulty_text)[0]
+                    except:     category = 'N/A'
+                    # rows without an achievement still count as page content, so they are only dropped afterwards
+                    rows.append({
+                        'name': columns[SolvedProblemsColumn.NAME].text_content(),
+                        'id': get_last_path(link),
+                        'runtime': replace_double_dash(columns[SolvedProblemsColumn.CPU_RUNTIME].text_content(), float('inf')),
+                        'length': replace_double_dash(columns[SolvedProblemsColumn.LENGTH].text_content(), -1),
+                        'achievement': achievement,
+                        'difficulty': difficulty,
+                        'category': category,
+                        'link': link
+                    })
+            return rows
+
+        data = [row for row in self.paginate(f'{self.get_base_url()}/users/{self.get_username()}', {'page': 1}, parse_page) if row['achievement']]
+        return self.Result(sorted(data, key=itemgetter('id')))
 
     @list_to_tuple
-    @lru_cache
+    @memoize
     def stats(self, languages=None, *bc_args):
         '''
         Collects the statistics of your accepted (AC) submissions based on the programming language(s) used. The languages parameter can be a string of a single language, or a sequence of languages.
@@ -503,59 +517,62 @@ class OpenKattis(ABCKattis):
         ret = []
         if type(languages) == str: languages = [languages]
 
-        for language in {*languages}:
-            if language and language not in self.get_database().get_languages(): print(f'[stats] Cannot find {language}, language specified must be one of {sorted(self.get_database().get_languages())}'); continue
+        def parse_page(response):
+            tree = parse_html(response.content)
+            table = tree.find('.//table[@class="table2 report_grid-problems_table double-rows"]')
+            rows = []
+            for row in get_tree_rows(table):
+                columns = CELLS_XPATH(row)
+                columns_text = [column.text_content() for column in columns]
+                if any(text.strip() for text in columns_text):
+                    pid = get_last_path(HREFS_XPATH(columns[SubmissionsColumn.CONTEST_PROBLEM_NAME])[-1]) # might have two links if it belongs to a contest
+                    tc_pass, tc_full = map(int, columns_text[SubmissionsColumn.TESTCASES].split('/'))
+
+                    # not converting runtime to float because some TLE solutions (with '>') can also be AC
+                    new_data = {
+                        'name': get_last_path(columns_text[SubmissionsColumn.CONTEST_PROBLEM_NAME]),
+                        'timestamp': columns_text[SubmissionsColumn.SUBMISSION_TIME].strip(),
+                        'runtime': ' '.join(columns_text[SubmissionsColumn.CPU_RUNTIME].split()[:-1]),
+                        'language': columns_text[SubmissionsColumn.PROGRAMMING_LANGUAGE].strip(),
+                        'test_case_passed': tc_pass,
+                        'test_case_full': tc_full,
+                        'link': f"{self.get_base_url()}/submissions/{get_last_path(HREFS_XPATH(columns[SubmissionsColumn.VIEW_DETAILS])[0])}"
+                    }
 
-            has_content = True
+                    pts_match = NUMBER_REGEX.search(columns_text[SubmissionsColumn.STATUS])
+                    if pts_match: new_data['score'] = float(pts_match[0])
+                    rows.append((pid, new_data))
+            return rows
+
+        user_url = f'{self.get_base_url()}/users/{self.get_username()}'
+        def scrape(param_language):
             params = {
                 'page': 0,
                 'status': 'AC',
-                'language': self.get_database().get_languages().get(language)
+                'language': param_language
             }
             data = {}
-            with ThreadPoolExecutor(max_workers=self.get_max_workers()) as executor:
-                futures = []
-                while has_content:
-                    has_content = False
-                    futures.clear()
-                    for _ in range(self.get_max_workers()):
-                        futures.append(executor.submit(self.new_get, f'{self.get_base_url()}/users/{self.get_username()}', params=params.copy()))
-                        params['page'] += 1
-                    for f in as_completed(futures):
-                        response = f.result()
-                        soup = bs(response.content, features='lxml')
-                        table = soup.find('table', class_='table2 report_grid-problems_table double-rows')
-                        for row in get_table_rows(table):
-                            columns = row.find_all('td')
-                            if [column.text.strip() for column in columns if column.text.strip()]:
-                                has_content = True
-                                pid = get_last_path(columns[SubmissionsColumn.CONTEST_PROBLEM_NAME].find_all('a')[-1].get('href')) # might have two links if it belongs to a contest
-                                tc_pass, tc_full = map(int, columns[SubmissionsColumn.TESTCASES].text.split('/'))
-
-                                # not converting runtime to float because some TLE solutions (with '>') can also be AC
-                                new_data = {
-                                    'name': get_last_path(columns[SubmissionsColumn.CONTEST_PROBLEM_NAME].text),
-                                    'timestamp': columns[SubmissionsColumn.SUBMISSION_TIME].text.strip(),
-                                    'runtime': ' '.join(columns[SubmissionsColumn.CPU_RUNTIME].text.split()[:-1]),
-                                    'language': columns[SubmissionsColumn.PROGRAMMING_LANGUAGE].text.strip(),
-                                    'test_case_passed': tc_pass,
-                                    'test_case_full': tc_full,
-                                    'link': f"{self.get_base_url()}/submissions/{get_last_path(columns[SubmissionsColumn.VIEW_DETAILS].find('a').get('href'))}"
-                                }
-
-                                pts_regex = re.findall(r'[\d\.]+', columns[SubmissionsColumn.STATUS].text)
-                                if pts_regex: new_data['score'] = float(pts_regex[0])
-                                data[pid] = new_data if pid not in data else max(
-                                    data[pid], new_data,
-                                    key=lambda x: (x.get('score', tc_pass/tc_full), x['test_case_passed'], -float(x['runtime'] if '>' not in x['runtime'] else 1e9))
-                                )
-
-            # wrap-up
-            ret.extend({'id': k, **v} for k, v in data.items())
-
-        return self.Result(sorted(ret, key=lambda x: x['id']))
-
-    @lru_cache
+            for pid, new_data in self.paginate(user_url, params, parse_page):
+                tc_pass, tc_full = new_data['test_case_passed'], new_data['test_case_full']
+                data[pid] = new_data if pid not in data else max(
+                    data[pid], new_data,
+                    key=lambda x: (x.get('score', tc_pass/tc_full), x['test_case_passed'], -float(x['runtime'] if '>' not in x['runtime'] else 1e9))
+                )
+            return [{'id': k, **v} for k, v in data.items()]
+
+        # a language name and its code (e.g. 'C++' and 'cpp') map to the same filter, so only scrape it once
+        param_languages, languages_map = set(), self.get_database().get_languages()
+        for language in {*languages}:
+            if language and language not in languages_map: print(f'[stats] Cannot find {language}, language specified must be one of {sorted(languages_map)}'); continue
+            param_languages.add(languages_map.get(language))
+
+        # every language is paginated at the same time
+        with ThreadPoolExecutor(max_workers=self.get_max_workers()) as executor:
+            for rows in executor.map(scrape, param_languages): ret.extend(rows)
+
+        return self.Result(sorted(ret, key=itemgetter('id')))
+
+    @memoize
     def suggest(self):
         '''
         Retrieves suggested problems based on what you have solved so far.
@@ -581,18 +598,17 @@ class OpenKattis(ABCKattis):
         ]
         '''
 
-        soup = self.get_homepage()
-        try:    table = soup.find_all('table', class_='table2 report_grid-problems_table')[0]
+        try:    table = GRID_TABLES_XPATH(self.get_homepage())[0]
         except: return self.Result([])
     
         data = []
-        for row in get_table_rows(table):
-            header = row.find('th')
-            if header: difficulty = header.text
-            column = row.find('td')
-            pid = get_last_path(column.find('a').get('href'))
+        for row in get_tree_rows(table):
+            header = row.find('.//th')
+            if header is not None: difficulty = header.text_content()
+            column = row.find('.//td')
+            pid = get_last_path(HREFS_XPATH(column)[0])
             link = f'{self.get_base_url()}/problems/{pid}'
-            name, pt = column.text.strip().split('\n')
+            name, pt = column.text_content().strip().split('\n')
             pt = pt.strip(' pt')
             data.append({
                 'pid': pid, 'difficulty': difficulty, 'name': name, 'link': link,
@@ -600,7 +616,7 @@ class OpenKattis(ABCKattis):
             })
         return self.Result(data)
 
-    @lru_cache
+    @memoize
     def user_ranklist(self):
         '''
         Retrieves the top 100 user ranklist.
@@ -632,32 +648,31 @@ class OpenKattis(ABCKattis):
         '''
 
         data = []
-        soup = self.get_soup_response(f'{self.get_base_url()}/ranklist')
-        try:        table = soup.find('table', class_='table2 report_grid-problems_table', id='top_users') or 1/0
+        tree = self.get_tree_response(f'{self.get_base_url()}/ranklist')
+        try:        table = TOP_USERS_TABLE_XPATH(tree)[0]
         except:     return self.Result([])
-        
-        headers = get_table_headers(table)
-        for row in get_table_rows(table):
-            columns = row.find_all('td')
+
+        for row in get_tree_rows(table):
+            columns = CELLS_XPATH(row)
             if len(columns) == 1: break # stop at ellipsis if any
 
-            columns_text = [column.text.strip() for column in columns]
-            columns_url = [column.find_all('a') for column in columns]
+            columns_text = [column.text_content().strip() for column in columns]
+            columns_url = [HREFS_XPATH(column) for column in columns]
 
             name_urls = columns_url[UserRanklistColumn.USER]
 
             country = columns_text[UserRanklistColumn.COUNTRY]
             country_urls = columns_url[UserRanklistColumn.COUNTRY]
-            country_code = get_last_path(country_urls[0].get('href')) if country_urls else None
+            country_code = get_last_path(country_urls[0]) if country_urls else None
 
             university = columns_text[UserRanklistColumn.UNIVERSITY]
             university_urls = columns_url[UserRanklistColumn.UNIVERSITY]
-            university_code = get_last_path(university_urls[0].get('href')) if university_urls else None
+            university_code = get_last_path(university_urls[0]) if university_urls else None
 
             data.append({
                 'rank': int(columns_text[UserRanklistColumn.RANK]) if columns_text[UserRanklistColumn.RANK].isdigit() else None,
                 'name': columns_text[UserRanklistColumn.USER],
-                'username': get_last_path(name_urls[0].get('href')),
+                'username': get_last_path(name_urls[0]),
                 'points': float(columns_text[UserRanklistColumn.SCORE]),
                 'country_code': country_code if country else None,
                 'country': country or None,
@@ -666,7 +681,7 @@ class OpenKattis(ABCKattis):
             })
         return self.Result(data)
 
-    @lru_cache
+    @memoize
     def country_ranklist(self, value=''):
         '''
         Retrieves the top 100 country ranklist if the value paramater is not set, otherwise a specific country's top 50.
@@ -725,22 +740,20 @@ class OpenKattis(ABCKattis):
         data = []
         if value == '':
             # display top 100 countries
-            soup = self.get_soup_response(f'{self.get_base_url()}/ranklist/countries')
-            try:        table = soup.find('table', class_='table2 report_grid-problems_table') or 1/0
+            tree = self.get_tree_response(f'{self.get_base_url()}/ranklist/countries')
+            try:        table = GRID_TABLES_XPATH(tree)[0]
             except:     return self.Result([])
 
-            headers = get_table_headers(table)
-            for row in get_table_rows(table):
-                columns = row.find_all('td')
+            for row in get_tree_rows(table):
+                columns = CELLS_XPATH(row)
                 if len(columns) == 1: break # stop at ellipsis if any
 
-                columns_text = [column.text.strip() for column in columns]
-                columns_url = [column.find_all('a') for column in columns]
+                columns_text = [column.text_content().strip() for column in columns]
 
                 data.append({
                     'rank': int(columns_text[CountryRanklistColumn.RANK]),
                     'country': columns_text[CountryRanklistColumn.COUNTRY],
-                    'country_code': get_last_path(columns_url[CountryRanklistColumn.COUNTRY][0].get('href')),
+                    'country_code': get_last_path(HREFS_XPATH(columns[CountryRanklistColumn.COUNTRY])[0]),
                     'users': int(columns_text[CountryRanklistColumn.USERS]),
                     'universities': int(columns_text[CountryRanklistColumn.UNIVERSITIES]),
                     'points': float(columns_text[CountryRanklistColumn.SCORE]),
@@ -748,39 +761,40 @@ class OpenKattis(ABCKattis):
         else:
             # display a specific country
             country_code = guess_id(value, self.get_database().get_countries())
-            soup = self.get_soup_response(f'{self.get_base_url()}/countries/{country_code}')
-            try:        table = soup.find('table', class_='table2 report_grid-problems_table', id='top_users') or 1/0
+            tree = self.get_tree_response(f'{self.get_base_url()}/countries/{country_code}')
+            try:        table = TOP_USERS_TABLE_XPATH(tree)[0]
             except:     return self.Result([])
 
-            headers = get_table_headers(table)
-            for row in get_table_rows(table):
-                columns = row.find_all('td')
+            headers = get_tree_headers(table)
+            has_subdivision, has_university = RanklistField.SUBDIVISION in headers, RanklistField.UNIVERSITY in headers
+            country = self.get_database().get_countries()[country_code]
+            for row in get_tree_rows(table):
+                columns = CELLS_XPATH(row)
                 if len(columns) == 1: break # stop at ellipsis if any
 
-                columns_text = [column.text.strip() for column in columns]
-                columns_url = [column.find_all('a') for column in columns]
+                columns_text = [column.text_content().strip() for column in columns]
 
-                if RanklistField.SUBDIVISION in headers:
+                if has_subdivision:
                     subdivision = columns_text[SingleCountryRanklistColumn.SUBDIVISION]
-                    subdivision_urls = columns_url[SingleCountryRanklistColumn.SUBDIVISION]
-                    subdivision_code = get_last_path(subdivision_urls[0].get('href')) if subdivision_urls else None
+                    subdivision_urls = HREFS_XPATH(columns[SingleCountryRanklistColumn.SUBDIVISION])
+                    subdivision_code = get_last_path(subdivision_urls[0]) if subdivision_urls else None
                 else:
                     subdivision = None
 
-                if RanklistField.UNIVERSITY in headers:
+                if has_university:
                     university = columns_text[SingleCountryRanklistColumn.UNIVERSITY]
-                    university_urls = columns_url[SingleCountryRanklistColumn.UNIVERSITY]
-                    university_code = get_last_path(university_urls[0].get('href')) if university_urls else None
+                    university_urls = HREFS_XPATH(columns[SingleCountryRanklistColumn.UNIVERSITY])
+                    university_code = get_last_path(university_urls[0]) if university_urls else None
                 else:
                     university = None
 
                 data.append({
                     'rank': int(columns_text[SingleCountryRanklistColumn.RANK]),
                     'name': columns_text[SingleCountryRanklistColumn.USER],
-                    'username': get_last_path(columns_url[SingleCountryRanklistColumn.USER][0].get('href')),
+                    'username': get_last_path(HREFS_XPATH(columns[SingleCountryRanklistColumn.USER])[0]),
                     'points': float(columns_text[SingleCountryRanklistColumn.SCORE]),
                     'country_code': country_code,
-                    'country': self.get_database().get_countries()[country_code],
+                    'country': country,
                     'subdivision_code': subdivision_code if subdivision else None,
                     'subdivision': subdivision or None,
                     'university_code': university_code if university else None,
@@ -788,7 +802,7 @@ class OpenKattis(ABCKattis):
                 })
         return self.Result(data)
 
-    @lru_cache
+    @memoize
     def university_ranklist(self, value=''):
         '''
         Retrieves the top 100 university ranklist if the value paramater is not set, otherwise a specific university's top 50.
@@ -851,24 +865,22 @@ class OpenKattis(ABCKattis):
         data = []
         if value == '':
             # display top 100 universities
-            soup = self.get_soup_response(f'{self.get_base_url()}/ranklist/universities')
-            try:        table = soup.find('table', class_='table2 report_grid-problems_table') or 1/0
+            tree = self.get_tree_response(f'{self.get_base_url()}/ranklist/universities')
+            try:        table = GRID_TABLES_XPATH(tree)[0]
             except:     return self.Result([])
 
-            headers = get_table_headers(table)
-            for row in get_table_rows(table):
-                columns = row.find_all('td')
+            for row in get_tree_rows(table):
+                columns = CELLS_XPATH(row)
                 if len(columns) == 1: break # stop at ellipsis if any
 
-                columns_text = [column.text.strip() for column in columns]
-                columns_url = [column.find_all('a') for column in columns]
+                columns_text = [column.text_content().strip() for column in columns]
 
                 data.append({
                     'rank': int(columns_text[UniversityRanklistColumn.RANK]),
                     'university': columns_text[UniversityRanklistColumn.UNIVERSITY],
-                    'university_code': get_last_path(columns_url[UniversityRanklistColumn.UNIVERSITY][0].get('href')),
+                    'university_code': get_last_path(HREFS_XPATH(columns[UniversityRanklistColumn.UNIVERSITY])[0]),
                     'country': columns_text[UniversityRanklistColumn.COUNTRY],
-                    'country_code': get_last_path(columns_url[UniversityRanklistColumn.COUNTRY][0].get('href')),
+                    'country_code': get_last_path(HREFS_XPATH(columns[UniversityRanklistColumn.COUNTRY])[0]),
                     'subdivision': columns_text[UniversityRanklistColumn.SUBDIVISION] or None,
                     'users': int(columns_text[UniversityRanklistColumn.USERS]),
                     'points': float(columns_text[UniversityRanklistColumn.SCORE]),
@@ -876,47 +888,48 @@ class OpenKattis(ABCKattis):
         else:
             # display a specific university
             university_code = guess_id(value, self.get_database().get_universities())
-            soup = self.get_soup_response(f'{self.get_base_url()}/universities/{university_code}')
-            table = soup.find('table', class_='table2 report_grid-problems_table', id='top_users')
-            if not table: return self.Result([])
+            tree = self.get_tree_response(f'{self.get_base_url()}/universities/{university_code}')
+            try:        table = TOP_USERS_TABLE_XPATH(tree)[0]
+            except:     return self.Result([])
 
-            headers = get_table_headers(table)
-            for row in get_table_rows(table):
-                columns = row.find_all('td')
+            headers = get_tree_headers(table)
+            has_country, has_subdivision = RanklistField.COUNTRY in headers, RanklistField.SUBDIVISION in headers
+            university = self.get_database().get_universities()[university_code]
+            for row in get_tree_rows(table):
+                columns = CELLS_XPATH(row)
                 if len(columns) == 1: break # stop at ellipsis if any
 
-                columns_text = [column.text.strip() for column in columns]
-                columns_url = [column.find_all('a') for column in columns]
+                columns_text = [column.text_content().strip() for column in columns]
 
-                if RanklistField.COUNTRY in headers:
+                if has_country:
                     country = columns_text[SingleUniversityRanklistColumn.COUNTRY]
-                    country_urls = columns_url[SingleUniversityRanklistColumn.COUNTRY]
-                    country_code = get_last_path(country_urls[0].get('href')) if country_urls else None
+                    country_urls = HREFS_XPATH(columns[SingleUniversityRanklistColumn.COUNTRY])
+                    country_code = get_last_path(country_urls[0]) if country_urls else None
                 else:
                     country = None
 
-                if RanklistField.SUBDIVISION in headers:
+                if has_subdivision:
                     subdivision = columns_text[SingleUniversityRanklistColumn.SUBDIVISION]
-                    subdivision_urls = columns_url[SingleUniversityRanklistColumn.SUBDIVISION]
-                    subdivision_code = get_last_path(subdivision_urls[0].get('href')) if subdivision_urls else None
+                    subdivision_urls = HREFS_XPATH(columns[SingleUniversityRanklistColumn.SUBDIVISION])
+                    subdivision_code = get_last_path(subdivision_urls[0]) if subdivision_urls else None
                 else:
                     subdivision = None
 
                 data.append({
                     'rank': int(columns_text[SingleUniversityRanklistColumn.RANK]),
                     'name': columns_text[SingleUniversityRanklistColumn.USER],
-                    'username': get_last_path(columns_url[SingleUniversityRanklistColumn.USER][0].get('href')),
+                    'username': get_last_path(HREFS_XPATH(columns[SingleUniversityRanklistColumn.USER])[0]),
                     'points': float(columns_text[SingleUniversityRanklistColumn.SCORE]),
                     'country_code': country_code if country else None,
                     'country': country or None,
                     'subdivision_code': subdivision_code if subdivision else None,
                     'subdivision': subdivision or None,
                     'university_code': university_code,
-                    'university': self.get_database().get_universities()[university_code]
+                    'university': university
                 })
         return self.Result(data)
 
-    @lru_cache
+    @memoize
     def challenge_ranklist(self):
         '''
         Retrieves the top 100 challenge ranklist.
@@ -948,32 +961,31 @@ class OpenKattis(ABCKattis):
         '''
 
         data = []
-        soup = self.get_soup_response(f'{self.get_base_url()}/ranklist/challenge')
-        try:        table = soup.find('table', class_='table2 report_grid-problems_table') or 1/0
+        tree = self.get_tree_response(f'{self.get_base_url()}/ranklist/challenge')
+        try:        table = GRID_TABLES_XPATH(tree)[0]
         except:     return self.Result([])
 
-        headers = get_table_headers(table)
-        for row in get_table_rows(table):
-            columns = row.find_all('td')
+        for row in get_tree_rows(table):
+            columns = CELLS_XPATH(row)
             if len(columns) == 1: break # stop at ellipsis if any
 
-            columns_text = [column.text.strip() for column in columns]
-            columns_url = [column.find_all('a') for column in columns]
+            columns_text = [column.text_content().strip() for column in columns]
+            columns_url = [HREFS_XPATH(column) for column in columns]
 
             name_urls = columns_url[ChallengeRanklistColumn.USER]
 
             country = columns_text[ChallengeRanklistColumn.COUNTRY]
             country_urls = columns_url[ChallengeRanklistColumn.COUNTRY]
-            country_code = get_last_path(country_urls[0].get('href')) if country_urls else None
+            country_code = get_last_path(country_urls[0]) if country_urls else None
 
             university = columns_text[ChallengeRanklistColumn.UNIVERSITY]
             university_urls = columns_url[ChallengeRanklistColumn.UNIVERSITY]
-            university_code = get_last_path(university_urls[0].get('href')) if university_urls else None
+            university_code = get_last_path(university_urls[0]) if university_urls else None
 
             data.append({
                 'rank': int(columns_text[ChallengeRanklistColumn.RANK]) if columns_text[ChallengeRanklistColumn.RANK].isdigit() else None,
                 'name': columns_text[ChallengeRanklistColumn.USER],
-                'username': get_last_path(name_urls[0].get('href')),
+                'username': get_last_path(name_urls[0]),
                 'score': float(columns_text[ChallengeRanklistColumn.CHALLENGE_SCORE]),
                 'country_code': country_code if country else None,
                 'country': country or None,
@@ -982,7 +994,7 @@ class OpenKattis(ABCKattis):
             })
         return self.Result(data)
 
-    @lru_cache
+    @memoize
     def ranklist(self, *bc_args):
         '''
         Retrieves the ranklist of users near your position.
@@ -1013,36 +1025,30 @@ class OpenKattis(ABCKattis):
         '''
 
         data = []
-        soup = self.get_homepage()
-        try:        table = soup.find_all('table', class_='table2 report_grid-problems_table')[1] or 1/0
+        try:        table = GRID_TABLES_XPATH(self.get_homepage())[1]
         except:     return self.Result([])
 
-        for row in get_table_rows(table):
-            columns = row.find_all('td')
-            columns_text = [column.text.strip() for column in columns]
+        for row in get_tree_rows(table):
+            columns = CELLS_XPATH(row)
+            columns_text = [column.text_content().strip() for column in columns]
 
             new_data = {
                 'rank': int(columns_text[DefaultRanklistColumn.RANK]) if columns_text[DefaultRanklistColumn.RANK].isdigit() else None,
                 'name': columns_text[DefaultRanklistColumn.USER],
-                'points': float(re.findall(r'[\d\.]+', columns_text[DefaultRanklistColumn.SCORE])[0]),
+                'points': float(NUMBER_REGEX.findall(columns_text[DefaultRanklistColumn.SCORE])[0]),
                 'country': None,
                 'university': None
             }
 
-            for urlsplit, title in [(column.get('href').split('/'), column.get('title')) for column in columns[DefaultRanklistColumn.USER].find_all('a')]:
-                assert sum(x in urlsplit for x in ['users', 'universities', 'countries']) == 1, 'Only one field should be present'
-                if 'users' in urlsplit:
-                    new_data['username'] = urlsplit[-1]
-                elif 'universities' in urlsplit:
-                    new_data['university_code'] = urlsplit[-1]
-                    new_data['university'] = title
-                elif 'countries' in urlsplit:
-                    new_data['country_code'] = urlsplit[-1]
-                    new_data['country'] = title
+            for link in columns[DefaultRanklistColumn.USER].iterfind('.//a'):
+                _, kind, code = link.get('href').rsplit('/', 2)
+                code_field, title_field = RANKLIST_LINK_FIELDS[kind]
+                new_data[code_field] = code
+                if title_field: new_data[title_field] = link.get('title')
             data.append(new_data)
         return self.Result(data)
 
-    @lru_cache
+    @memoize
     def problem_authors(self):
         '''
         Lists down all problem authors.
@@ -1066,32 +1072,28 @@ class OpenKattis(ABCKattis):
         ]
         '''
 
-        response = self.new_get(f'{self.get_base_url()}/problem-authors')
-        try:        soup = bs(response.content, features='lxml')
-        except:     return self.Result([])
-
-        table = soup.find('table', class_='table2')
-        if not table: return self.Result([])
+        tree = self.get_tree_response(f'{self.get_base_url()}/problem-authors')
+        try:                table = TABLE2_XPATH(tree)[0]
+        except IndexError:  return self.Result([])
 
         data = []
-        for row in get_table_rows(table):
-            columns = row.find_all('td')
-            columns_text = [column.text.strip() for column in columns]
-            columns_url = [column.find_all('a') for column in columns]
+        for row in get_tree_rows(table):
+            columns = CELLS_XPATH(row)
+            difficulty_text = columns[ProblemAuthorsColumn.AVG_DIFF].text_content()
 
-            try:        difficulty = float(re.findall('[\d\.]+', columns_text[ProblemAuthorsColumn.AVG_DIFF])[-1])
+            try:        difficulty = float(NUMBER_REGEX.findall(difficulty_text)[-1])
             except:     difficulty = None
 
             data.append({
-                'name': columns_text[ProblemAuthorsColumn.AUTHOR].strip(),
-                'problems': int(columns_text[ProblemAuthorsColumn.PROBLEMS]),
+                'name': columns[ProblemAuthorsColumn.AUTHOR].text_content().strip(),
+                'problems': int(columns[ProblemAuthorsColumn.PROBLEMS].text_content()),
                 'avg_difficulty': difficulty,
-                'avg_category': (re.findall('[A-Za-z]+', columns_text[ProblemAuthorsColumn.AVG_DIFF]) or ['N/A'])[0],
-                'link': f'{self.get_base_url()}{columns_url[ProblemAuthorsColumn.AUTHOR][0].get("href")}'
+                'avg_category': (WORD_REGEX.findall(difficulty_text) or ['N/A'])[0],
+                'link': f'{self.get_base_url()}{HREFS_XPATH(columns[ProblemAuthorsColumn.AUTHOR])[0]}'
             })
         return self.Result(data)
 
-    @lru_cache
+    @memoize
     def problem_sources(self):
         '''
         Lists down all problem sources.
@@ -1115,27 +1117,23 @@ class OpenKattis(ABCKattis):
         ]
         '''
 
-        response = self.new_get(f'{self.get_base_url()}/problem-sources')
-        try:        soup = bs(response.content, features='lxml')
-        except:     return self.Result([])
-
-        table = soup.find('table', class_='table2')
-        if not table: return self.Result([])
+        tree = self.get_tree_response(f'{self.get_base_url()}/problem-sources')
+        try:                table = TABLE2_XPATH(tree)[0]
+        except IndexError:  return self.Result([])
 
         data = []
-        for row in get_table_rows(table):
-            columns = row.find_all('td')
-            columns_text = [column.text.strip() for column in columns]
-            columns_url = [column.find_all('a') for column in columns]
+        for row in get_tree_rows(table):
+            columns = CELLS_XPATH(row)
+            difficulty_text = columns[ProblemSourcesColumn.AVG_DIFF].text_content()
 
-            try:        difficulty = float(re.findall('[\d\.]+', columns_text[ProblemSourcesColumn.AVG_DIFF])[-1])
+            try:        difficulty = float(NUMBER_REGEX.findall(difficulty_text)[-1])
             except:     difficulty = None
 
             data.append({
-                'name': columns_text[ProblemSourcesColumn.SOURCE].strip(),
-                'problems': int(columns_text[ProblemSourcesColumn.PROBLEMS]),
+                'name': columns[ProblemSourcesColumn.SOURCE].text_content().strip(),
+                'problems': int(columns[ProblemSourcesColumn.PROBLEMS].text_content()),
                 'avg_difficulty': difficulty,
-                'avg_category': (re.findall('[A-Za-z]+', columns_text[ProblemSourcesColumn.AVG_DIFF]) or ['N/A'])[0],
-                'link': f'{self.get_base_url()}{columns_url[ProblemSourcesColumn.SOURCE][0].get("href")}'
+                'avg_category': (WORD_REGEX.findall(difficulty_text) or ['N/A'])[0],
+                'link': f'{self.get_base_url()}{HREFS_XPATH(columns[ProblemSourcesColumn.SOURCE])[0]}'
             })
         return self.Result(data)
@@ -1,9 +1,38 @@
 from functools import wraps
-import re
+from threading import local
 import warnings
 
+from lxml import etree, html
 from thefuzz import fuzz
 
+# re2 matches in linear time and is a drop-in for these simple patterns, so it is used when installed
+try:                import re2 as re
+except ImportError: import re
+
+# compiled once since they run on every row of every page
+CELLS_XPATH = etree.XPath('.//td')
+HREFS_XPATH = etree.XPath('.//a/@href', smart_strings=False)
+TABLE2_XPATH = etree.XPath('//table[contains(concat(" ", @class, " "), " table2 ")]')
+SUBMISSIONS_TAB_TABLE_XPATH = etree.XPath('//div[@id="submissions-tab"]//section[@class="strip strip-item-plain"]//table[contains(concat(" ", @class, " "), " table2 ")]')
+PROBLEM_BODY_XPATH = etree.XPath('//div[contains(concat(" ", @class, " "), " problembody ")]')
+PROBLEM_CARDS_XPATH = etree.XPath('//div[contains(concat(" ", @class, " "), " metadata-grid ")]//div[contains(concat(" ", @class, " "), " card ")]')
+STATISTICS_SECTIONS_XPATH = etree.XPath('//section[@class="strip strip-item-plain"]')
+CATEGORY_OPTIONS_XPATH = etree.XPath('//option[@value]')
+NUMBER_REGEX = re.compile(r'[\d.]+')
+WORD_REGEX = re.compile(r'[A-Za-z]+')
+SPACES_REGEX = re.compile(' {2,}')
+
+# parsers are not thread-safe, so each worker thread keeps one instead of building a fresh one per page;
+# Kattis always serves UTF-8, so libxml2 is told up front rather than guessing (it falls back to Latin-1)
+PARSERS = local()
+
+def get_html_parser():
+    if not hasattr(PARSERS, 'parser'): PARSERS.parser = html.HTMLParser(encoding='utf-8', remove_comments=True)
+    return PARSERS.parser
+
+def parse_html(content):
+    return html.fromstring(content, parser=get_html_parser())
+
 def guess_id(guess, data):
     if guess in data: return guess
     reverse_mapping = {v:k for k,v in data.items()}
@@ -17,7 +46,7 @@ def guess_id(guess, data):
     raise Exception(f'Invalid ID provided! ({guess})')
 
 def truncate_spaces(text):
-    return text if (new_text:=text.replace('  ', ' ')) == text else truncate_spaces(new_text)
+    return SPACES_REGEX.sub(' ', text)
 
 def replace_double_dash(text, new):
     return type(new)(text.replace('--', str(new)).strip())
@@ -26,16 +55,25 @@ def remove_brackets(text):
     return text.replace('(', '').replace(')', '').strip()
 
 def get_last_path(link):
-    return link.split('/')[-1].strip()
+    return link.rpartition('/')[2].strip()
 
 def suppress_warnings():
     warnings.warn = lambda *args, **kwargs: None
 
-def get_table_headers(table):
-    return [re.findall(r'[A-Za-z]+', h.text)[0] for h in table.find_all('th')]
+def get_tree_headers(table):
+    return [WORD_REGEX.findall(h.text_content())[0] for h in table.iter('th')]
 
-def get_table_rows(table):
-    return table.tbody.find_all('tr')
+def get_tree_rows(table):
+    return table.find('.//tbody').iter('tr')
+
+def memoize(fn):
+    # results live on the instance rather than in a global lru_cache that keeps every instance alive
+    @wraps(fn)
+    def helper(slf, *args, **kwargs):
+        key = (fn.__name__, args, frozenset(kwargs.items()))
+        if key not in slf.memo: slf.memo[key] = fn(slf, *args, **kwargs)
+        return slf.memo[key]
+    return helper
 
 def list_to_tuple(fn):
     @wraps(fn)
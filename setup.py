@@ -16,7 +16,6 @@ setup_args = dict(
     keywords=['Kattis'],
     install_requires = [
         'requests',
-        'beautifulsoup4',
         'lxml',
         'pandas',
         'matplotlib',
@@ -24,6 +23,10 @@ setup_args = dict(
         'thefuzz',
         'thefuzz[speedup]',
     ],
+    extras_require = {
+        'cache': ['requests-cache'],
+        're2': ['google-re2'],
+    },
     url='https://github.com/RussellDash332/autokattis',
     download_url='https://pypi.org/project/autokattis/'
 )
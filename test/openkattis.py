@@ -19,6 +19,7 @@ test('open_problem_single_download',        kt.problem,             {'problem_id
 test('open_problem_multiple_nodownload',    kt.problem,             {'problem_ids': ['2048', 'abinitio', 'teque']})
 test('open_problem_multiple_download',      kt.problem,             {'problem_ids': {'2048', 'abinitio', 'teque'}, 'download_files': True})
 test('open_problem_invalid',                kt.problem,             {'problem_ids': ('@?@?', 'ABC')})
+test('open_problem_metadata_only',          kt.problem,             {'problem_ids': '2048', 'with_statistics': False, 'with_submissions': False})
 
 test('open_achievements',                   kt.achievements,        {})
 
@@ -48,3 +49,12 @@ test('open_ranklist',                       kt.ranklist,            {})
 test('open_problem_authors',                kt.problem_authors,     {})
 
 test('open_problem_sources',                kt.problem_sources,     {})
+
+def cache_skips_homepage():
+    from requests_cache import DO_NOT_CACHE
+    from requests_cache.policy.expiration import get_url_expiration
+    cached = OpenKattis(USER, PASSWORD, use_cache=True)
+    for url in (cached.get_base_url(), cached.get_base_url() + '/'):
+        assert get_url_expiration(url, cached.get_session().settings.urls_expire_after) == DO_NOT_CACHE, url
+
+test('open_cache_skips_homepage',           cache_skips_homepage,   {})